@@ -0,0 +1,281 @@
+"""
+A local OpenAI-compatible chat completions endpoint that answers with canned
+`ComicAnalysis` JSON after a configurable delay, so the pipeline can be
+benchmarked without network access or API costs.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional, Union
+
+# Box ids in the legacy, "json" and "table" OCR payload formats. A "json" entry
+# is followed by a coordinate, which tells it apart from the output format example.
+_BOX_ID = re.compile(r"'id': '(\d+)'|\[\"(\d+)\",(?=-?\d)|^(\d+)\|", re.MULTILINE)
+
+# The OCR block of each page in a multi-page prompt.
+_PAGE_BLOCK = re.compile(r"^Page (\S+):\n```\n(.*?)\n```", re.MULTILINE | re.DOTALL)
+
+# The previous response quoted in a repair prompt.
+_REPAIR = re.compile(r"could not be parsed:\s*```\n(.*?)\n```", re.DOTALL)
+
+_ERROR_RESPONSES = [
+    (429, {"Retry-After": "0.2"}, "Rate limit reached"),
+    (503, {}, "Service unavailable"),
+]
+
+# Characters of content per streamed chunk.
+_STREAM_CHUNK = 64
+
+
+def canned_analysis(box_ids: List[str], group_size: int = 3) -> dict:
+    """Groups consecutive box IDs into bubbles, a few bubbles per panel."""
+    groups = []
+    for n, start in enumerate(range(0, len(box_ids), group_size)):
+        panel = n // 4 + 1
+        groups.append(
+            {
+                "panel_id": str(panel),
+                "text_bubble_id": f"{panel}-{n % 4 + 1}",
+                "box_ids": box_ids[start:start + group_size],
+                "original_text": "lorem ipsum",
+                "cleaned_text": "Lorem ipsum.",
+                "type": "dialogue",
+                "style": "normal",
+                "notes": "none",
+            }
+        )
+    return {"groups": groups}
+
+
+class FakeMLLMServer:
+    """
+    Serves `POST .../chat/completions` on a background thread.
+
+    Args:
+        latency (float): Seconds to wait before answering each request. Streamed
+                         responses spread it over their chunks.
+        jitter (float): Extra random delay of up to this many seconds.
+        group_size (int): OCR boxes per canned group.
+        error_rate (float): Fraction of requests answered with a 429 (with
+                            Retry-After) or a 503 instead of a completion.
+        invalid_rate (float): Fraction of completions whose groups lack the
+                              required "type" field. Repair prompts are answered
+                              with the fixed response.
+        host (str), port (int): Address to bind; port 0 picks a free port.
+        seed (int, optional): Seed for the jitter and the injected errors and
+                              invalid responses. Runs with the same seed draw the
+                              same sequence; with concurrent requests, which
+                              request gets which draw depends on arrival order.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        group_size: int = 3,
+        error_rate: float = 0.0,
+        invalid_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.group_size = group_size
+        self.error_rate = error_rate
+        self.invalid_rate = invalid_rate
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+    def start(self) -> "FakeMLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeMLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _respond(self, body: bytes) -> Union[bytes, Iterator[bytes], tuple]:
+        request = json.loads(body)
+        prompt = "".join(
+            part.get("text", "")
+            for message in request.get("messages", [])
+            for part in (
+                message["content"]
+                if isinstance(message["content"], list)
+                else [{"text": message["content"]}]
+            )
+        )
+        with self._lock:
+            self.requests += 1
+            self.bytes_received += len(body)
+            failed = self._random.random() < self.error_rate
+            self.errors += failed
+        if failed:
+            return _ERROR_RESPONSES[self._random.randrange(len(_ERROR_RESPONSES))]
+
+        repair = _REPAIR.search(prompt)
+        if repair:
+            analysis = json.loads(repair.group(1))
+            for group in analysis["groups"]:
+                group.setdefault("type", "dialogue")
+        else:
+            if _PAGE_BLOCK.search(prompt):
+                analysis = {"groups": []}
+                for page_id, block in _PAGE_BLOCK.findall(prompt):
+                    box_ids = ["".join(match) for match in _BOX_ID.findall(block)]
+                    for group in canned_analysis(box_ids, self.group_size)["groups"]:
+                        analysis["groups"].append({"page_id": page_id, **group})
+            else:
+                box_ids = ["".join(match) for match in _BOX_ID.findall(prompt)]
+                analysis = canned_analysis(box_ids, self.group_size)
+            if self._random.random() < self.invalid_rate:
+                for group in analysis["groups"]:
+                    del group["type"]
+        content = json.dumps(analysis)
+        prompt_tokens = len(body) // 4
+        completion_tokens = len(content) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if request.get("stream"):
+            return self._stream_events(request, content, usage)
+
+        time.sleep(self.latency + self._random.uniform(0, self.jitter))
+        return json.dumps(
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        ).encode("utf-8")
+
+    def _stream_events(self, request: dict, content: str, usage: dict) -> Iterator[bytes]:
+        """Server-sent events for a streamed response, spreading the latency over the chunks."""
+        pieces = [content[i:i + _STREAM_CHUNK] for i in range(0, len(content), _STREAM_CHUNK)]
+        delay = (self.latency + self._random.uniform(0, self.jitter)) / max(1, len(pieces))
+
+        def event(delta: dict, finish_reason: Optional[str] = None, **extra) -> bytes:
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": request.get("model", "fake"),
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+        yield event({"role": "assistant", "content": ""})
+        for piece in pieces:
+            time.sleep(delay)
+            yield event({"content": piece})
+        yield event({}, "stop")
+        if (request.get("stream_options") or {}).get("include_usage"):
+            # Like the OpenAI API: a last chunk with no choices carries the usage.
+            yield event({}, choices=[], usage=usage)
+        yield b"data: [DONE]\n\n"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.rstrip("/").endswith("chat/completions"):
+                    self.send_error(404)
+                    return
+                payload = server._respond(body)
+                if isinstance(payload, tuple):
+                    status, headers, message = payload
+                    error = json.dumps({"error": {"message": message, "type": "fake_error"}}).encode("utf-8")
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(error)))
+                    self.end_headers()
+                    self.wfile.write(error)
+                    return
+                if not isinstance(payload, bytes):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    self.close_connection = True
+                    for event in payload:
+                        self.wfile.write(event)
+                        self.wfile.flush()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    with FakeMLLMServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        invalid_rate=args.invalid_rate,
+        port=args.port,
+        seed=args.seed,
+    ) as fake:
+        print(f"Serving fake MLLM at {fake.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
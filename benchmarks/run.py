@@ -0,0 +1,169 @@
+"""
+End-to-end benchmark of `ComiQ.extract` against a local fake MLLM server.
+
+Runs every combination of page size and text density, sequentially and through
+`extract_batch`, and reports throughput, latency percentiles, mean per-stage
+times from `PipelineMetrics` and peak memory. Needs no network or GPU when the
+default "synthetic" OCR engine is used.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --pages 40 --latency 1.0 --ai-workers 8 --json results.json
+    python -m benchmarks.run --ocr easyocr --sizes 1200x1800
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+import comiq
+from comiq import ComiQ, PipelineMetrics, RequestScheduler
+from .fake_server import FakeMLLMServer
+from .synthetic import detect_text_synthetic, make_page
+
+comiq.register_ocr_engine("synthetic", detect_text_synthetic)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_case(
+    client: ComiQ,
+    pages: list,
+    ocr: str,
+    mode: str,
+    ocr_workers: int,
+    ai_workers: int,
+) -> Dict[str, Any]:
+    metrics: List[PipelineMetrics] = []
+    errors = 0
+    start = time.perf_counter()
+    if mode in ("sequential", "stream"):
+        client.metrics_callback = metrics.append
+        try:
+            for page in pages:
+                try:
+                    if mode == "sequential":
+                        client.extract(page, ocr=ocr)
+                    else:
+                        for _ in client.extract_stream(page, ocr=ocr):
+                            pass
+                except Exception:
+                    errors += 1
+        finally:
+            client.metrics_callback = None
+    else:
+        for result in client.extract_batch(
+            pages, ocr=ocr, ocr_workers=ocr_workers, ai_workers=ai_workers
+        ):
+            errors += result.error is not None
+            metrics.append(result.metrics)
+    elapsed = time.perf_counter() - start
+
+    latencies = [m.stages["total"] for m in metrics]
+    stage_names = sorted({name for m in metrics for name in m.stages} - {"total"})
+    return {
+        "pages": len(pages),
+        "errors": errors,
+        "seconds": elapsed,
+        "pages_per_sec": len(pages) / elapsed,
+        "p50": _percentile(latencies, 50),
+        "p95": _percentile(latencies, 95),
+        "stages": {
+            name: statistics.mean(m.stages.get(name, 0.0) for m in metrics) for name in stage_names
+        },
+        "boxes": statistics.mean(m.counters.get("ocr_boxes", 0) for m in metrics),
+        "bytes_sent": statistics.mean(m.counters.get("bytes_sent", 0) for m in metrics),
+        "retries": sum(m.counters.get("retries", 0) for m in metrics),
+        "repairs": sum(m.counters.get("repairs", 0) for m in metrics),
+        "peak_rss_mb": (metrics[-1].peak_rss_bytes or 0) / 2**20,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20, help="Pages per case.")
+    parser.add_argument("--sizes", nargs="+", default=["800x1200", "1200x1800", "2400x3600"],
+                        help="Page sizes as WIDTHxHEIGHT.")
+    parser.add_argument("--densities", nargs="+", type=int, default=[1, 3],
+                        help="Bubbles per panel.")
+    parser.add_argument("--ocr", default="synthetic", help="OCR engine to benchmark.")
+    parser.add_argument("--modes", nargs="+", default=["sequential", "batch"],
+                        choices=["sequential", "batch", "stream"])
+    parser.add_argument("--latency", type=float, default=0.3, help="Fake MLLM latency in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Random extra latency in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of fake MLLM requests that fail with 429/503.")
+    parser.add_argument("--invalid-rate", type=float, default=0.0,
+                        help="Fraction of fake MLLM responses that fail validation.")
+    parser.add_argument("--rpm", type=float, help="Use a RequestScheduler limited to this many requests/min.")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Use a RequestScheduler with this many attempts per request.")
+    parser.add_argument("--regions", action="store_true",
+                        help="Run OCR only on the regions found by the OpenCV pre-pass.")
+    parser.add_argument("--pages-per-request", type=int, default=1,
+                        help="Pack up to this many pages into one request (batch modes).")
+    parser.add_argument("--ocr-workers", type=int, default=1)
+    parser.add_argument("--ai-workers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed for the fake server's jitter and injected failures, and "
+                             "for the retry backoff.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+    # RequestScheduler draws its backoff jitter from the global generator.
+    random.seed(args.seed)
+
+    results = []
+    scheduler = None
+    if args.rpm or args.retries:
+        scheduler = RequestScheduler(
+            requests_per_minute=args.rpm, max_attempts=max(1, args.retries), backoff_base=0.2
+        )
+    with FakeMLLMServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        invalid_rate=args.invalid_rate,
+        seed=args.seed,
+    ) as server:
+        client = ComiQ(
+            api_key="benchmark",
+            model_name="fake",
+            base_url=server.base_url,
+            scheduler=scheduler,
+            ocr={"regions": True} if args.regions else {},
+            multi_page={"max_pages": args.pages_per_request},
+        )
+        for size in args.sizes:
+            width, height = map(int, size.lower().split("x"))
+            for density in args.densities:
+                pages = [
+                    make_page(width, height, bubbles_per_panel=density, seed=seed)
+                    for seed in range(args.pages)
+                ]
+                for mode in args.modes:
+                    result = run_case(client, pages, args.ocr, mode, args.ocr_workers, args.ai_workers)
+                    result.update({"size": size, "density": density, "mode": mode})
+                    results.append(result)
+                    stages = " ".join(f"{k}={v * 1000:.0f}ms" for k, v in result["stages"].items())
+                    print(
+                        f"{size:>10} d={density} {mode:<10} "
+                        f"{result['pages_per_sec']:6.2f} pages/s  "
+                        f"p50={result['p50'] * 1000:6.0f}ms p95={result['p95'] * 1000:6.0f}ms  "
+                        f"boxes={result['boxes']:.0f} sent={result['bytes_sent'] / 1024:.0f}KiB  "
+                        f"rss={result['peak_rss_mb']:.0f}MiB  errors={result['errors']} "
+                        f"retries={result['retries']} repairs={result['repairs']}\n"
+                        f"{'':>14}{stages}"
+                    )
+        client.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
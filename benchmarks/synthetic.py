@@ -0,0 +1,83 @@
+"""
+Synthetic comic pages and a model-free OCR engine for benchmarking.
+
+Pages are drawn with OpenCV: a grid of bordered panels, each holding a few
+speech bubbles with lines of random words. `detect_text_synthetic` finds the
+word boxes with thresholding and contours, standing in for a real engine at a
+small, predictable CPU cost.
+"""
+import random
+from typing import Any, Dict, List
+import cv2
+import numpy as np
+
+_WORDS = (
+    "WHAT HE SAID THE KICK WAS TOO MUCH FOR HER TO HANDLE WE HAVE TO GO NOW "
+    "WAIT DONT LEAVE ME HERE BEHIND YOU LOOK OUT NO WAY THIS CANT BE HAPPENING"
+).split()
+
+
+def make_page(
+    width: int = 1200,
+    height: int = 1800,
+    bubbles_per_panel: int = 2,
+    lines_per_bubble: int = 3,
+    seed: int = 0,
+) -> np.ndarray:
+    """Draws a BGR comic page with 2 columns of panels roughly 600 px tall."""
+    rng = random.Random(seed)
+    page = np.full((height, width, 3), 255, dtype=np.uint8)
+    rows = max(1, height // 600)
+    margin = 20
+    panel_w = (width - 3 * margin) // 2
+    panel_h = (height - (rows + 1) * margin) // rows
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    scale = 0.7
+    line_h = 28
+
+    for row in range(rows):
+        for col in range(2):
+            x0 = margin + col * (panel_w + margin)
+            y0 = margin + row * (panel_h + margin)
+            cv2.rectangle(page, (x0, y0), (x0 + panel_w, y0 + panel_h), (0, 0, 0), 4)
+            # Some background texture so the art is not completely flat.
+            for _ in range(8):
+                cx, cy = rng.randint(x0, x0 + panel_w), rng.randint(y0, y0 + panel_h)
+                cv2.circle(page, (cx, cy), rng.randint(20, 80), (200, 200, 200), -1)
+
+            slot_h = panel_h // max(1, bubbles_per_panel)
+            for b in range(bubbles_per_panel):
+                lines = [
+                    " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 4)))
+                    for _ in range(lines_per_bubble)
+                ]
+                text_w = max(cv2.getTextSize(line, font, scale, 2)[0][0] for line in lines)
+                text_w = min(text_w, panel_w - 60)
+                text_h = line_h * lines_per_bubble
+                bx = x0 + rng.randint(30, max(30, panel_w - text_w - 30))
+                by = y0 + b * slot_h + rng.randint(30, max(30, slot_h - text_h - 30))
+                center = (bx + text_w // 2, by + text_h // 2)
+                axes = (text_w // 2 + 30, text_h // 2 + 25)
+                cv2.ellipse(page, center, axes, 0, 0, 360, (255, 255, 255), -1)
+                cv2.ellipse(page, center, axes, 0, 0, 360, (0, 0, 0), 2)
+                for i, line in enumerate(lines):
+                    cv2.putText(page, line, (bx, by + (i + 1) * line_h - 8), font, scale, (0, 0, 0), 2)
+    return page
+
+
+def detect_text_synthetic(image: np.ndarray, **kwargs) -> List[Dict[str, Any]]:
+    """Finds word boxes on a synthetic page without any model."""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    _, binary = cv2.threshold(gray, 128, 255, cv2.THRESH_BINARY_INV)
+    words = cv2.dilate(binary, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 3)))
+    contours, _ = cv2.findContours(words, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+    results = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        # Keep text-sized blobs; skip panel borders and bubble outlines.
+        if 8 <= h <= 40 and 8 <= w <= 400:
+            results.append(
+                {"text_box": [y, x, y + h, x + w], "text": "LOREM", "confidence": 0.9}
+            )
+    return results
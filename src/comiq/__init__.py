@@ -1,5 +1,27 @@
-from .comiq import ComiQ
-from .ocr import register_ocr_engine, get_available_ocr_engines
+from .comiq import ComiQ, PageResult, PageState
+from .cache import ResultCache
+from .metrics import PipelineMetrics, metrics_logger
+from .scheduler import RequestScheduler
+from .ocr import (
+    register_ocr_engine,
+    get_available_ocr_engines,
+    warm_up_ocr_engines,
+    close_ocr_engines,
+)
+from .ocr_workers import OCRProcessPool
 
 __version__ = "0.1.5"
-__all__ = ["ComiQ", "register_ocr_engine", "get_available_ocr_engines"]
+__all__ = [
+    "ComiQ",
+    "PageResult",
+    "PageState",
+    "ResultCache",
+    "PipelineMetrics",
+    "metrics_logger",
+    "RequestScheduler",
+    "register_ocr_engine",
+    "get_available_ocr_engines",
+    "warm_up_ocr_engines",
+    "close_ocr_engines",
+    "OCRProcessPool",
+]
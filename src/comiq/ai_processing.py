@@ -1,62 +1,341 @@
+import asyncio
 import base64
+import functools
 import io
 import json
-from openai import OpenAI
-from PIL import Image
-from typing import Dict, List
-from pydantic import ValidationError
-from .prompts import comic_prompt
-from .models import ComicAnalysis, Group
+import logging
+import time
+from collections import Counter
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Tuple, Type,
+    Union,
+)
+from pydantic import BaseModel, ValidationError
+from .prompts import (
+    comic_prompt, comic_prompt_compact, comic_prompt_multi_page, ocr_page_block,
+    ocr_payload_descriptions,
+)
+from .metrics import PipelineMetrics
+from .scheduler import RequestScheduler, estimate_tokens
+from .models import ComicAnalysis, Group, MultiPageAnalysis, PageGroup
+from .utils import BoxArray
 
+# The OpenAI SDK and Pillow are imported on first use to keep `import comiq` fast.
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+_IMAGE_FORMATS = {
+    "PNG": "image/png",
+    "JPEG": "image/jpeg",
+    "JPG": "image/jpeg",
+    "WEBP": "image/webp",
+}
+
+
+# Leading bytes of the formats a page can be sent in unchanged.
+_IMAGE_SIGNATURES = {
+    b"\x89PNG\r\n\x1a\n": "PNG",
+    b"\xff\xd8\xff": "JPEG",
+}
+
+
+class EncodedImage(NamedTuple):
+    """An image encoded for the AI request, with the cost of encoding it."""
+    data: str
+    mime_type: str
+    width: int
+    height: int
+    size_bytes: int
+    encode_seconds: float
+
+
+def prepare_image(
+    image: "Image.Image",
+    max_side: Optional[int] = None,
+    format: str = "PNG",
+    quality: int = 90,
+    grayscale: bool = False,
+) -> EncodedImage:
+    """
+    Resizes and encodes an image for the AI request.
+
+    The OCR boxes sent with the image are on a 0-1000 scale, so resizing does
+    not invalidate them.
+
+    Args:
+        image (PIL.Image): The page image.
+        max_side (int, optional): Downscale so the longest side is at most this many pixels.
+        format (str): "PNG" (lossless), "JPEG" or "WEBP".
+        quality (int): Quality for JPEG and WEBP, 1-100.
+        grayscale (bool): Convert to a single channel before encoding.
+    """
+    from PIL import Image
+
+    start = time.perf_counter()
+    format = format.upper()
+    if format not in _IMAGE_FORMATS:
+        raise ValueError(
+            f"Unsupported image format '{format}'. Choose from: {sorted(_IMAGE_FORMATS)}"
+        )
+    if format == "JPG":
+        format = "JPEG"
+
+    if max_side is not None and max(image.size) > max_side:
+        scale = max_side / max(image.size)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        image = image.resize(size, Image.LANCZOS)
+    if grayscale:
+        image = image.convert("L")
+    elif format == "JPEG" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
 
-def get_base64_image(image: Image) -> str:
-    """Get base64 representation of an image."""
     buffered = io.BytesIO()
-    image.save(buffered, format="PNG")
-    return base64.b64encode(buffered.getvalue()).decode("utf-8")
+    if format == "PNG":
+        image.save(buffered, format=format)
+    else:
+        image.save(buffered, format=format, quality=quality)
+    raw = buffered.getvalue()
 
+    encoded = EncodedImage(
+        data=base64.b64encode(raw).decode("utf-8"),
+        mime_type=_IMAGE_FORMATS[format],
+        width=image.width,
+        height=image.height,
+        size_bytes=len(raw),
+        encode_seconds=time.perf_counter() - start,
+    )
+    logger.debug(
+        "Encoded %dx%d %s image: %d bytes in %.3fs",
+        encoded.width, encoded.height, format, encoded.size_bytes, encoded.encode_seconds,
+    )
+    return encoded
 
-def process_with_ai(
-    image: Image,
-    ocr_results: Dict[str, List[Dict]],
-    mllm_api_key: str,
-    model_name: str,
-    base_url: str,
-    temperature: float = 0.0,
-    top_p: float = 1.0,
-    **kwargs,
-) -> ComicAnalysis:
-    """Process OCR results with AI and validate with Pydantic."""
-    client = configure_openai(mllm_api_key, base_url)
-    base64_image = get_base64_image(image)
-    prompt = comic_prompt.format(ocr_results)
 
-    response = client.chat.completions.create(
-        model=model_name,
-        messages=[
+def sniff_image_format(data: Any) -> Optional[str]:
+    """Returns "PNG", "JPEG" or "WEBP" for a buffer holding such a file, else None."""
+    head = bytes(memoryview(data)[:12])
+    for signature, format in _IMAGE_SIGNATURES.items():
+        if head.startswith(signature):
+            return format
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def encode_original(
+    data: Any,
+    width: int,
+    height: int,
+    max_side: Optional[int] = None,
+    format: str = "PNG",
+    quality: int = 90,
+    grayscale: bool = False,
+) -> Optional[EncodedImage]:
+    """
+    Returns the file a page was decoded from as an `EncodedImage`, or None if it
+    has to be re-encoded with `prepare_image`. Takes the same options.
+
+    The file is sent unchanged when it is a PNG, JPEG or WEBP that needs no
+    downscaling or grayscale conversion, and it is either in the requested
+    `format` or the requested format is PNG, which would only make a lossy file
+    bigger. `quality` is not applied to a file that is already in the requested
+    format. JPEGs with EXIF data are re-encoded, since the model might apply an
+    orientation tag that the OCR boxes do not.
+    """
+    start = time.perf_counter()
+    if grayscale:
+        return None
+    if max_side is not None and max(width, height) > max_side:
+        return None
+    source_format = sniff_image_format(data)
+    format = "JPEG" if format.upper() == "JPG" else format.upper()
+    if source_format is None or (source_format != format and format != "PNG"):
+        return None
+    if source_format == "JPEG" and b"Exif\x00\x00" in bytes(memoryview(data)[:65536]):
+        return None
+
+    encoded = EncodedImage(
+        data=base64.b64encode(data).decode("ascii"),
+        mime_type=_IMAGE_FORMATS[source_format],
+        width=width,
+        height=height,
+        size_bytes=memoryview(data).nbytes,
+        encode_seconds=time.perf_counter() - start,
+    )
+    logger.debug(
+        "Sending the original %dx%d %s file: %d bytes",
+        width, height, source_format, encoded.size_bytes,
+    )
+    return encoded
+
+
+def _encode_image(
+    image: Union["Image.Image", EncodedImage], image_encoding: Optional[Dict[str, Any]]
+) -> EncodedImage:
+    if isinstance(image, EncodedImage):
+        return image
+    return prepare_image(image, **(image_encoding or {}))
+
+
+def get_base64_image(image: "Image.Image") -> str:
+    """Get base64 representation of an image."""
+    return prepare_image(image).data
+
+
+def _prompt_boxes(ocr_results: Union[List[Dict], BoxArray]) -> List[Dict]:
+    """Keeps only the box fields the model needs; extra fields such as confidence cost tokens."""
+    if isinstance(ocr_results, BoxArray):
+        return ocr_results.to_bounds()
+    return [
+        {"text_box": bound["text_box"], "text": bound["text"], "id": bound["id"]}
+        for bound in ocr_results
+    ]
+
+
+OCR_PAYLOAD_FORMATS = ("legacy", "json", "table")
+
+
+def encode_ocr_payload(
+    ocr_results: Union[List[Dict], BoxArray], ocr_format: str = "legacy"
+) -> str:
+    """
+    Serializes the OCR boxes for the prompt.
+
+    - "legacy": the Python representation of the box dictionaries (the original format).
+    - "json": minified JSON, one `[id, ymin, xmin, ymax, xmax, text]` array per box.
+    - "table": one `id|ymin,xmin,ymax,xmax|text` line per box.
+
+    The compact formats do not repeat the key names for every box, which makes the
+    OCR block several times smaller on dense pages. `ocr_results` may be box dicts
+    or a `BoxArray`.
+    """
+    bounds = _prompt_boxes(ocr_results)
+    if ocr_format == "legacy":
+        return str(bounds)
+    if ocr_format == "json":
+        return json.dumps(
+            [[bound["id"], *bound["text_box"], bound["text"]] for bound in bounds],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+    if ocr_format == "table":
+        return "\n".join(
+            f"{bound['id']}|{','.join(str(v) for v in bound['text_box'])}|"
+            f"{' '.join(bound['text'].split())}"
+            for bound in bounds
+        )
+    raise ValueError(
+        f"Unknown OCR payload format '{ocr_format}'. Choose from: {list(OCR_PAYLOAD_FORMATS)}"
+    )
+
+
+def build_prompt(ocr_results: Union[List[Dict], BoxArray], ocr_format: str = "legacy") -> str:
+    """Builds the grouping prompt with the OCR boxes encoded in `ocr_format`."""
+    payload = encode_ocr_payload(ocr_results, ocr_format)
+    if ocr_format == "legacy":
+        return comic_prompt.format(payload)
+    return comic_prompt_compact.format(payload, ocr_payload_descriptions[ocr_format])
+
+
+def number_pages(
+    ocr_results: List[Union[List[Dict], BoxArray]]
+) -> Tuple[List[List[Dict]], Dict[str, Tuple[int, str]]]:
+    """
+    Renumbers the boxes of several pages so their ids are unique across one request.
+
+    Returns the renumbered boxes of each page and a map from each new id to the
+    index of its page and its original id.
+    """
+    pages = []
+    id_map: Dict[str, Tuple[int, str]] = {}
+    for page, bounds in enumerate(ocr_results):
+        renumbered = []
+        for bound in _prompt_boxes(bounds):
+            box_id = str(len(id_map))
+            id_map[box_id] = (page, bound["id"])
+            renumbered.append({**bound, "id": box_id})
+        pages.append(renumbered)
+    return pages, id_map
+
+
+def build_multi_page_prompt(
+    ocr_results: List[Union[List[Dict], BoxArray]],
+    page_ids: List[str],
+    ocr_format: str = "legacy",
+) -> str:
+    """
+    Builds the grouping prompt for several pages, with one block of OCR boxes per
+    page. The box ids must be unique across the pages (see `number_pages`).
+    """
+    blocks = "\n\n".join(
+        ocr_page_block.format(page_id, encode_ocr_payload(bounds, ocr_format))
+        for page_id, bounds in zip(page_ids, ocr_results)
+    )
+    return comic_prompt_multi_page.format(blocks, ocr_payload_descriptions[ocr_format])
+
+
+def _record_request_size(
+    metrics: PipelineMetrics,
+    images: List[EncodedImage],
+    prompt: str,
+    scheduler: Optional[RequestScheduler],
+) -> int:
+    """Records the size of a request and returns its estimated prompt tokens."""
+    for encoded in images:
+        metrics.add_time("encode", encoded.encode_seconds)
+        metrics.count("image_bytes", encoded.size_bytes)
+        metrics.count("bytes_sent", len(encoded.data))
+    metrics.count("bytes_sent", len(prompt.encode("utf-8")))
+    if scheduler is not None:
+        prompt_tokens = scheduler.estimate_tokens(prompt)
+    else:
+        prompt_tokens = estimate_tokens(prompt)
+    metrics.count("prompt_tokens_estimate", prompt_tokens)
+    return prompt_tokens
+
+
+def build_messages(prompt: str, base64_image: str, mime_type: str = "image/png") -> List[Dict]:
+    """Builds the chat messages carrying the prompt and the page image."""
+    return [
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:{mime_type};base64,{base64_image}"},
+                },
+            ],
+        }
+    ]
+
+
+def build_multi_page_messages(
+    prompt: str, images: List[EncodedImage], page_ids: List[str]
+) -> List[Dict]:
+    """Builds the chat messages carrying the prompt and each page image after its page id."""
+    content = [{"type": "text", "text": prompt}]
+    for page_id, image in zip(page_ids, images):
+        content.append({"type": "text", "text": f"Page {page_id}:"})
+        content.append(
             {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {
-                        "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{base64_image}"},
-                    },
-                ],
+                "type": "image_url",
+                "image_url": {"url": f"data:{image.mime_type};base64,{image.data}"},
             }
-        ],
-        response_format={"type": "json_object"},
-        temperature=temperature,
-        top_p=top_p,
-        **kwargs,
-    )
+        )
+    return [{"role": "user", "content": content}]
+
 
-    response_text = response.choices[0].message.content
+def _validate_response(response_text: str, model: Type[BaseModel], group_model: Type[Group]):
+    """Validates the model's raw response text into `model`, a `{"groups": [...]}` schema."""
     cleaned_text = response_text.strip().removeprefix("```json").removesuffix("```").strip()
 
     try:
         # First, try to validate the expected object structure: {"groups": [...]}
-        return ComicAnalysis.model_validate_json(cleaned_text)
+        return model.model_validate_json(cleaned_text)
     except ValidationError as e:
         # If that fails, check if the AI returned a raw list: [...]
         try:
@@ -64,11 +343,11 @@ def process_with_ai(
             if isinstance(parsed_json, list):
                 # Check if it's a list of Group objects: [{"panel_id": ...}, ...]
                 if parsed_json and isinstance(parsed_json[0], dict) and 'panel_id' in parsed_json[0]:
-                    groups = [Group.model_validate(item) for item in parsed_json]
-                    return ComicAnalysis(groups=groups)
+                    groups = [group_model.model_validate(item) for item in parsed_json]
+                    return model(groups=groups)
                 # Check if it's a list containing a ComicAnalysis-like object: [{"groups": [...]}]
                 elif parsed_json and isinstance(parsed_json[0], dict) and 'groups' in parsed_json[0]:
-                    return ComicAnalysis.model_validate(parsed_json[0])
+                    return model.model_validate(parsed_json[0])
                 else:
                     raise e
             else:
@@ -79,9 +358,507 @@ def process_with_ai(
             raise e
 
 
-def configure_openai(mllm_api_key: str, base_url: str) -> OpenAI:
-    """Configure and return an OpenAI client."""
+def parse_ai_response(response_text: str) -> ComicAnalysis:
+    """Validates the model's raw response text into a ComicAnalysis."""
+    return _validate_response(response_text, ComicAnalysis, Group)
+
+
+def parse_multi_page_response(response_text: str) -> MultiPageAnalysis:
+    """Validates the raw response to a multi-page request into a MultiPageAnalysis."""
+    return _validate_response(response_text, MultiPageAnalysis, PageGroup)
+
+
+def split_multi_page_analysis(
+    analysis: MultiPageAnalysis, id_map: Dict[str, Tuple[int, str]], page_ids: List[str]
+) -> List[ComicAnalysis]:
+    """
+    Splits the response to a multi-page request into one `ComicAnalysis` per page,
+    with the box ids mapped back to each page's own ids.
+
+    A group belongs to its `page_id` if that page holds any of its boxes, and
+    otherwise to the page holding most of them; boxes from other pages are
+    dropped. Groups without any known box are dropped.
+    """
+    index = {page_id: i for i, page_id in enumerate(page_ids)}
+    per_page: List[List[Group]] = [[] for _ in page_ids]
+    for group in analysis.groups:
+        boxes = [id_map[box_id] for box_id in group.box_ids if box_id in id_map]
+        if not boxes:
+            continue
+        pages = [page for page, _ in boxes]
+        page = index.get(group.page_id)
+        if page not in pages:
+            page = Counter(pages).most_common(1)[0][0]
+        per_page[page].append(
+            Group(
+                **group.model_dump(exclude={"page_id", "box_ids"}),
+                box_ids=[box_id for owner, box_id in boxes if owner == page],
+            )
+        )
+    return [ComicAnalysis(groups=groups) for groups in per_page]
+
+
+class GroupStreamParser:
+    """
+    Incremental parser for a streamed `{"groups": [...]}` response.
+
+    `feed()` takes the response text chunk by chunk and returns the groups that
+    each chunk completed, validated as `Group` objects. Only the array under the
+    top-level "groups" key, or a top-level list, is read incrementally; brackets
+    in strings or in other keys are skipped. `close()` validates the full text
+    with `parse_ai_response`, returns the groups the incremental parse did not
+    deliver, and raises if the response is not valid.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.delivered = 0
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._groups_depth: Optional[int] = None
+        self._start = 0
+        self._stopped = False
+
+    def _opens_groups(self) -> bool:
+        """Whether a "[" at the current position opens the groups array."""
+        if not self._stack:
+            return True
+        return self._stack == ["{"] and self._key == "groups"
+
+    def feed(self, chunk: str) -> List[Group]:
+        self.text += chunk
+        if self._stopped:
+            return []
+        text = self.text
+        groups = []
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._expect_key and self._stack[-1] == "{":
+                        self._key = text[self._string_start + 1:i]
+                continue
+            if not self._stack and char not in "{[":
+                # Text around the JSON, such as a Markdown fence.
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":":
+                self._expect_key = False
+            elif char == ",":
+                self._expect_key = self._stack[-1] == "{"
+            elif char in "{[":
+                if char == "[" and self._groups_depth is None and self._opens_groups():
+                    self._groups_depth = len(self._stack) + 1
+                elif self._groups_depth is not None and len(self._stack) == self._groups_depth:
+                    self._start = i
+                self._stack.append(char)
+                self._expect_key = char == "{"
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                depth = len(self._stack)
+                if self._groups_depth is not None and depth == self._groups_depth:
+                    try:
+                        groups.append(Group.model_validate_json(text[self._start:i + 1]))
+                    except ValidationError:
+                        # Not a list of groups; leave it to the full parse in close().
+                        self._stopped = True
+                        break
+                elif self._groups_depth is not None and depth < self._groups_depth:
+                    # The groups array is complete; close() checks the rest.
+                    self._stopped = True
+                    break
+                self._expect_key = False
+        self._pos = len(text)
+        self.delivered += len(groups)
+        return groups
+
+    def close(self) -> List[Group]:
+        groups = parse_ai_response(self.text).groups[self.delivered:]
+        self.delivered += len(groups)
+        return groups
+
+
+# Asks for a final chunk with the token usage of a streamed response.
+_STREAM_USAGE = {"include_usage": True}
+
+
+def _stream_groups(chunks: Iterator[Any], metrics: PipelineMetrics) -> Iterator[Group]:
+    parser = GroupStreamParser()
+    start = time.perf_counter()
+    for chunk in chunks:
+        if getattr(chunk, "usage", None) is not None:
+            metrics.record_usage(chunk.usage)
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        for group in parser.feed(chunk.choices[0].delta.content):
+            if parser.delivered == 1:
+                metrics.add_time("first_group", time.perf_counter() - start)
+            yield group
+    metrics.add_time("request", time.perf_counter() - start)
+    with metrics.stage("parse"):
+        remaining = parser.close()
+    yield from remaining
+
+
+async def _astream_groups(chunks: AsyncIterator[Any], metrics: PipelineMetrics) -> AsyncIterator[Group]:
+    parser = GroupStreamParser()
+    start = time.perf_counter()
+    async for chunk in chunks:
+        if getattr(chunk, "usage", None) is not None:
+            metrics.record_usage(chunk.usage)
+        if not chunk.choices or not chunk.choices[0].delta.content:
+            continue
+        for group in parser.feed(chunk.choices[0].delta.content):
+            if parser.delivered == 1:
+                metrics.add_time("first_group", time.perf_counter() - start)
+            yield group
+    metrics.add_time("request", time.perf_counter() - start)
+    with metrics.stage("parse"):
+        remaining = parser.close()
+    for group in remaining:
+        yield group
+
+
+def process_with_ai(
+    image: Union["Image.Image", EncodedImage],
+    ocr_results: Union[List[Dict], BoxArray],
+    mllm_api_key: str,
+    model_name: str,
+    base_url: str,
+    temperature: float = 0.0,
+    top_p: float = 1.0,
+    client: Optional["OpenAI"] = None,
+    image_encoding: Optional[Dict[str, Any]] = None,
+    ocr_format: str = "legacy",
+    metrics: Optional[PipelineMetrics] = None,
+    stream: bool = False,
+    scheduler: Optional[RequestScheduler] = None,
+    **kwargs,
+) -> Union[ComicAnalysis, Iterator[Group]]:
+    """
+    Process OCR results with AI and validate with Pydantic. Pass a long-lived
+    `client` to reuse its connection pool; otherwise a new client is created.
+    `image_encoding` holds keyword arguments for `prepare_image`, which is
+    skipped when `image` is already an `EncodedImage` (see `encode_original`), and
+    `ocr_format` selects how the boxes are serialized (see `encode_ocr_payload`).
+    If `metrics` is given, encoding, request and parsing times, bytes sent and
+    token usage are recorded in it.
+
+    With `stream=True` the response is streamed and an iterator is returned that
+    yields each `Group` as soon as the model has finished writing it. The usage
+    chunk is requested with `stream_options={"include_usage": True}` unless
+    `stream_options` is given; pass None for providers that reject it.
+
+    With a `scheduler`, the request is rate limited, retried and its response
+    repaired as configured there. Streamed requests are retried only until the
+    provider accepts them, and are not repaired.
+    """
+    if client is None:
+        client = configure_openai(mllm_api_key, base_url)
+    metrics = metrics or PipelineMetrics()
+    encoded = _encode_image(image, image_encoding)
+    prompt = build_prompt(ocr_results, ocr_format)
+    prompt_tokens = _record_request_size(metrics, [encoded], prompt, scheduler)
+
+    messages = build_messages(prompt, encoded.data, encoded.mime_type)
+    # Only sent with streamed requests; `stream_options=None` leaves it out for
+    # providers that reject it.
+    stream_options = kwargs.pop("stream_options", _STREAM_USAGE)
+    request = functools.partial(
+        client.chat.completions.create,
+        model=model_name,
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        top_p=top_p,
+        **kwargs,
+    )
+
+    if stream:
+        if stream_options is not None:
+            request = functools.partial(request, stream_options=stream_options)
+        if scheduler is not None:
+            chunks = scheduler.open_stream(request, messages, prompt_tokens, metrics)
+        else:
+            chunks = request(messages=messages, stream=True)
+        return _stream_groups(chunks, metrics)
+
+    if scheduler is not None:
+        return scheduler.run(
+            request, messages, prompt_tokens, parse_ai_response, metrics
+        )
+
+    with metrics.stage("request"):
+        response = request(messages=messages)
+    metrics.record_usage(getattr(response, "usage", None))
+
+    with metrics.stage("parse"):
+        return parse_ai_response(response.choices[0].message.content)
+
+
+async def aprocess_with_ai(
+    image: Union["Image.Image", EncodedImage],
+    ocr_results: Union[List[Dict], BoxArray],
+    mllm_api_key: str,
+    model_name: str,
+    base_url: str,
+    temperature: float = 0.0,
+    top_p: float = 1.0,
+    client: Optional["AsyncOpenAI"] = None,
+    image_encoding: Optional[Dict[str, Any]] = None,
+    ocr_format: str = "legacy",
+    metrics: Optional[PipelineMetrics] = None,
+    stream: bool = False,
+    scheduler: Optional[RequestScheduler] = None,
+    **kwargs,
+) -> Union[ComicAnalysis, AsyncIterator[Group]]:
+    """
+    Asynchronous counterpart of `process_with_ai`. With `stream=True` the
+    awaited result is an async iterator of `Group` objects.
+    """
+    if client is None:
+        client = configure_async_openai(mllm_api_key, base_url)
+    # Encoding a large page is CPU bound; keep it off the event loop.
+    loop = asyncio.get_running_loop()
+    metrics = metrics or PipelineMetrics()
+    encoded = await loop.run_in_executor(None, _encode_image, image, image_encoding)
+    prompt = build_prompt(ocr_results, ocr_format)
+    prompt_tokens = _record_request_size(metrics, [encoded], prompt, scheduler)
+
+    messages = build_messages(prompt, encoded.data, encoded.mime_type)
+    # Only sent with streamed requests; `stream_options=None` leaves it out for
+    # providers that reject it.
+    stream_options = kwargs.pop("stream_options", _STREAM_USAGE)
+    request = functools.partial(
+        client.chat.completions.create,
+        model=model_name,
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        top_p=top_p,
+        **kwargs,
+    )
+
+    if stream:
+        if stream_options is not None:
+            request = functools.partial(request, stream_options=stream_options)
+        if scheduler is not None:
+            chunks = await scheduler.aopen_stream(request, messages, prompt_tokens, metrics)
+        else:
+            chunks = await request(messages=messages, stream=True)
+        return _astream_groups(chunks, metrics)
+
+    if scheduler is not None:
+        return await scheduler.arun(
+            request, messages, prompt_tokens, parse_ai_response, metrics
+        )
+
+    with metrics.stage("request"):
+        response = await request(messages=messages)
+    metrics.record_usage(getattr(response, "usage", None))
+
+    with metrics.stage("parse"):
+        return parse_ai_response(response.choices[0].message.content)
+
+
+def _multi_page_request(
+    images: List[EncodedImage],
+    ocr_results: List[Union[List[Dict], BoxArray]],
+    page_ids: Optional[List[str]],
+    ocr_format: str,
+    metrics: PipelineMetrics,
+    scheduler: Optional[RequestScheduler],
+):
+    """
+    Builds the messages of a multi-page request, its estimated prompt tokens and
+    the parser that splits its response.
+    """
+    if len(images) != len(ocr_results):
+        raise ValueError("Expected one list of OCR results per image.")
+    page_ids = page_ids or [str(i + 1) for i in range(len(images))]
+    pages, id_map = number_pages(ocr_results)
+    prompt = build_multi_page_prompt(pages, page_ids, ocr_format)
+    prompt_tokens = _record_request_size(metrics, images, prompt, scheduler)
+
+    def parse(response_text: str) -> List[ComicAnalysis]:
+        return split_multi_page_analysis(
+            parse_multi_page_response(response_text), id_map, page_ids
+        )
+
+    return build_multi_page_messages(prompt, images, page_ids), prompt_tokens, parse
+
+
+def process_pages_with_ai(
+    images: List[Union["Image.Image", EncodedImage]],
+    ocr_results: List[Union[List[Dict], BoxArray]],
+    mllm_api_key: str,
+    model_name: str,
+    base_url: str,
+    temperature: float = 0.0,
+    top_p: float = 1.0,
+    client: Optional["OpenAI"] = None,
+    image_encoding: Optional[Dict[str, Any]] = None,
+    ocr_format: str = "legacy",
+    metrics: Optional[PipelineMetrics] = None,
+    scheduler: Optional[RequestScheduler] = None,
+    page_ids: Optional[List[str]] = None,
+    **kwargs,
+) -> List[ComicAnalysis]:
+    """
+    Groups the OCR boxes of several pages in one AI request, which saves the
+    instructions, connection setup and time to first token of the other requests
+    on pages with little text.
+
+    Each image is sent after its page id ("1", "2", ... unless `page_ids` is
+    given) and the boxes are renumbered to be unique across the pages. The model
+    tags every group with its page (`MultiPageAnalysis`), and the response is
+    split back into one `ComicAnalysis` per page, in the order of `images`, with
+    the box ids of `ocr_results`. Other arguments are as for `process_with_ai`.
+    """
+    if client is None:
+        client = configure_openai(mllm_api_key, base_url)
+    metrics = metrics or PipelineMetrics()
+    encoded = [_encode_image(image, image_encoding) for image in images]
+    messages, prompt_tokens, parse = _multi_page_request(
+        encoded, ocr_results, page_ids, ocr_format, metrics, scheduler
+    )
+    kwargs.pop("stream_options", None)
+    request = functools.partial(
+        client.chat.completions.create,
+        model=model_name,
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        top_p=top_p,
+        **kwargs,
+    )
+
+    if scheduler is not None:
+        # The scheduler counts one image per request; add the others.
+        tokens = prompt_tokens + (len(images) - 1) * scheduler.image_tokens
+        return scheduler.run(request, messages, tokens, parse, metrics)
+
+    with metrics.stage("request"):
+        response = request(messages=messages)
+    metrics.record_usage(getattr(response, "usage", None))
+
+    with metrics.stage("parse"):
+        return parse(response.choices[0].message.content)
+
+
+async def aprocess_pages_with_ai(
+    images: List[Union["Image.Image", EncodedImage]],
+    ocr_results: List[Union[List[Dict], BoxArray]],
+    mllm_api_key: str,
+    model_name: str,
+    base_url: str,
+    temperature: float = 0.0,
+    top_p: float = 1.0,
+    client: Optional["AsyncOpenAI"] = None,
+    image_encoding: Optional[Dict[str, Any]] = None,
+    ocr_format: str = "legacy",
+    metrics: Optional[PipelineMetrics] = None,
+    scheduler: Optional[RequestScheduler] = None,
+    page_ids: Optional[List[str]] = None,
+    **kwargs,
+) -> List[ComicAnalysis]:
+    """Asynchronous counterpart of `process_pages_with_ai`."""
+    if client is None:
+        client = configure_async_openai(mllm_api_key, base_url)
+    loop = asyncio.get_running_loop()
+    metrics = metrics or PipelineMetrics()
+    encoded = [
+        await loop.run_in_executor(None, _encode_image, image, image_encoding) for image in images
+    ]
+    messages, prompt_tokens, parse = _multi_page_request(
+        encoded, ocr_results, page_ids, ocr_format, metrics, scheduler
+    )
+    kwargs.pop("stream_options", None)
+    request = functools.partial(
+        client.chat.completions.create,
+        model=model_name,
+        response_format={"type": "json_object"},
+        temperature=temperature,
+        top_p=top_p,
+        **kwargs,
+    )
+
+    if scheduler is not None:
+        tokens = prompt_tokens + (len(images) - 1) * scheduler.image_tokens
+        return await scheduler.arun(request, messages, tokens, parse, metrics)
+
+    with metrics.stage("request"):
+        response = await request(messages=messages)
+    metrics.record_usage(getattr(response, "usage", None))
+
+    with metrics.stage("parse"):
+        return parse(response.choices[0].message.content)
+
+
+def configure_openai(
+    mllm_api_key: str,
+    base_url: str,
+    timeout: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    pool_limits: Optional[Dict[str, Any]] = None,
+) -> "OpenAI":
+    """
+    Configure and return an OpenAI client.
+
+    `pool_limits` is passed to `httpx.Limits` (e.g. `max_connections`,
+    `max_keepalive_connections`, `keepalive_expiry`) to size the client's
+    keep-alive connection pool.
+    """
+    import httpx
+    from openai import DefaultHttpxClient, OpenAI
+
+    options = _client_options(timeout, max_retries)
+    if pool_limits:
+        # Keeps the SDK's own client settings, such as following redirects.
+        options["http_client"] = DefaultHttpxClient(limits=httpx.Limits(**pool_limits))
     return OpenAI(
         api_key=mllm_api_key,
         base_url=base_url,
+        **options,
     )
+
+
+def configure_async_openai(
+    mllm_api_key: str,
+    base_url: str,
+    timeout: Optional[float] = None,
+    max_retries: Optional[int] = None,
+    pool_limits: Optional[Dict[str, Any]] = None,
+) -> "AsyncOpenAI":
+    """Configure and return an asynchronous OpenAI client."""
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    options = _client_options(timeout, max_retries)
+    if pool_limits:
+        options["http_client"] = DefaultAsyncHttpxClient(limits=httpx.Limits(**pool_limits))
+    return AsyncOpenAI(
+        api_key=mllm_api_key,
+        base_url=base_url,
+        **options,
+    )
+
+
+def _client_options(timeout: Optional[float], max_retries: Optional[int]) -> Dict[str, Any]:
+    options = {}
+    if timeout is not None:
+        options["timeout"] = timeout
+    if max_retries is not None:
+        options["max_retries"] = max_retries
+    return options
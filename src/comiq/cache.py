@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+from .models import ComicAnalysis
+
+
+def hash_image(image: np.ndarray) -> str:
+    """Returns a content hash of an image array, including its shape and dtype."""
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(f"{image.shape}|{image.dtype.str}".encode("utf-8"))
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    """Converts the numpy arrays and scalars custom OCR engines may return."""
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _hash_json(payload: Any) -> str:
+    def default(value: Any) -> Any:
+        try:
+            return _json_default(value)
+        except TypeError:
+            return repr(value)
+
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=default)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=32).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache for OCR results and AI groupings.
+
+    Entries live in a single SQLite database and are stored in two layers:
+    ``ocr`` (keyed by image hash, engines and OCR config) and ``ai`` (keyed by
+    image hash, OCR boxes, prompt, model and request parameters). Entries older
+    than ``ttl`` seconds are treated as misses, and once the stored values exceed
+    ``max_size_bytes`` the least recently used entries are evicted.
+
+    The cache is safe to share between threads and, through SQLite's locking,
+    between processes.
+    """
+
+    def __init__(
+        self,
+        path: str = ".comiq_cache.sqlite",
+        max_size_bytes: Optional[int] = 512 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " layer TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " PRIMARY KEY (layer, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+            )
+
+    # --- Keys ---
+
+    @staticmethod
+    def ocr_key(image_hash: str, methods: List[str], config: Dict[str, Any]) -> str:
+        """Key for the OCR results of an image with the given engines and config."""
+        return _hash_json({"image": image_hash, "methods": methods, "config": config})
+
+    @staticmethod
+    def ai_key(
+        image_hash: str,
+        ocr_results: List[Dict],
+        prompt: str,
+        model_name: str,
+        params: Dict[str, Any],
+    ) -> str:
+        """Key for the AI grouping of a page's OCR boxes."""
+        return _hash_json(
+            {
+                "image": image_hash,
+                "ocr": ocr_results,
+                "prompt": prompt,
+                "model": model_name,
+                "params": params,
+            }
+        )
+
+    # --- Layers ---
+
+    def get_ocr(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        value = self._get("ocr", key)
+        return None if value is None else json.loads(value)
+
+    def set_ocr(self, key: str, results: List[Dict[str, Any]]):
+        self._set("ocr", key, json.dumps(results, default=_json_default).encode("utf-8"))
+
+    def get_ai(self, key: str) -> Optional[ComicAnalysis]:
+        value = self._get("ai", key)
+        return None if value is None else ComicAnalysis.model_validate_json(value)
+
+    def set_ai(self, key: str, analysis: ComicAnalysis):
+        self._set("ai", key, analysis.model_dump_json().encode("utf-8"))
+
+    # --- Storage ---
+
+    def _get(self, layer: str, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created FROM entries WHERE layer = ? AND key = ?",
+                (layer, key),
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE layer = ? AND key = ?", (layer, key)
+                )
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE layer = ? AND key = ?",
+                (now, layer, key),
+            )
+        return value
+
+    def _set(self, layer: str, key: str, value: bytes):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (layer, key, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (layer, key, value, len(value), now, now),
+            )
+            self._evict_locked()
+
+    def _evict_locked(self):
+        if self.ttl is not None:
+            self._conn.execute(
+                "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)
+            )
+        if self.max_size_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT layer, key, size FROM entries ORDER BY accessed"
+        ).fetchall()
+        stale = []
+        for layer, key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            stale.append((layer, key))
+            total -= size
+        self._conn.executemany("DELETE FROM entries WHERE layer = ? AND key = ?", stale)
+
+    def size_bytes(self) -> int:
+        """Total size of the stored values."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+
+    def clear(self):
+        """Removes every entry from both layers."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
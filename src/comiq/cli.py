@@ -0,0 +1,273 @@
+"""
+Command-line batch runner for ComiQ.
+
+Processes image files, directories and CBZ/ZIP archives through
+`ComiQ.extract_batch` and appends one JSON line per finished page to the output
+file. Completed pages are recorded in a manifest next to the output, keyed by the
+hash of the page file, so an interrupted job resumes where it stopped:
+
+    comiq volume1.cbz volume2.cbz scans/ -o results.jsonl --ocr easyocr
+    comiq scans/ -o results.jsonl --ocr-workers 2 --ai-workers 8 --rpm 60
+
+Run the same command again to resume. Pages already in the manifest are neither
+recognized nor sent to the model, and pages that were in flight are served from
+the result cache kept next to the output.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import zipfile
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set
+from .cache import ResultCache
+from .comiq import ComiQ
+from .ocr import register_ocr_engine
+from .scheduler import RequestScheduler
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff")
+ARCHIVE_EXTENSIONS = (".cbz", ".zip")
+
+
+class PageSource(NamedTuple):
+    """A page file on disk or inside an archive, and the hash of its bytes."""
+    source: str
+    member: Optional[str]
+    hash: str
+    data: bytes
+
+
+def _natural_key(name: str) -> List[Any]:
+    """Sort key that orders "page2" before "page10"."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def _expand_inputs(inputs: List[str]) -> Iterator[str]:
+    """Yields the image and archive files named by `inputs`, walking directories."""
+    for path in inputs:
+        if os.path.isdir(path):
+            found = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort(key=_natural_key)
+                found.extend(
+                    os.path.join(root, name)
+                    for name in files
+                    if name.lower().endswith(IMAGE_EXTENSIONS + ARCHIVE_EXTENSIONS)
+                )
+            yield from sorted(found, key=_natural_key)
+        elif os.path.isfile(path):
+            yield path
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+
+
+def iter_pages(inputs: List[str]) -> Iterator[PageSource]:
+    """
+    Yields every page of `inputs` in natural order. Archive members are read one
+    at a time, so large archives are never extracted to disk or held in memory.
+    """
+    for path in _expand_inputs(inputs):
+        if path.lower().endswith(ARCHIVE_EXTENSIONS):
+            with zipfile.ZipFile(path) as archive:
+                members = [
+                    info.filename
+                    for info in archive.infolist()
+                    if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTENSIONS)
+                ]
+                for member in sorted(members, key=_natural_key):
+                    data = archive.read(member)
+                    yield PageSource(path, member, _hash_bytes(data), data)
+        else:
+            with open(path, "rb") as f:
+                data = f.read()
+            yield PageSource(path, None, _hash_bytes(data), data)
+
+
+class JobManifest:
+    """
+    Append-only record of the pages whose results are in the output file.
+
+    Each line holds a page hash and the size of the output file after that page's
+    result was written. On opening, both files are cut back to the last complete
+    entry, so a page that was interrupted between the two writes is neither lost
+    nor duplicated; it is simply processed again.
+    """
+
+    def __init__(self, path: str, output_path: str):
+        self.path = path
+        self.output_path = output_path
+        self.done: Set[str] = set()
+
+        manifest_size = 0
+        output_size = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.done.add(entry["hash"])
+                        output_size = entry["offset"]
+                    except (ValueError, KeyError):
+                        break
+                    manifest_size += len(line)
+        self._manifest = open(path, "ab")
+        self._manifest.truncate(manifest_size)
+        self._output = open(output_path, "ab")
+        self._output.truncate(output_size)
+
+    def write(self, page: PageSource, data: List[Dict[str, Any]]):
+        """Appends a page's result to the output, then records it as done."""
+        record = {"source": page.source, "member": page.member, "hash": page.hash, "groups": data}
+        self._output.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._output.flush()
+        entry = {"hash": page.hash, "offset": self._output.tell()}
+        self._manifest.write(json.dumps(entry).encode("utf-8") + b"\n")
+        self._manifest.flush()
+        self.done.add(page.hash)
+
+    def close(self):
+        for f in (self._output, self._manifest):
+            f.flush()
+            os.fsync(f.fileno())
+            f.close()
+
+
+def _load_config(path: Optional[str]) -> Dict[str, Any]:
+    if path is None:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _describe(page: PageSource) -> str:
+    return f"{page.source}:{page.member}" if page.member else page.source
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="comiq", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("inputs", nargs="+", help="Image files, directories or CBZ/ZIP archives.")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file the results are appended to.")
+    parser.add_argument("--manifest", help="Manifest of completed pages. Defaults to OUTPUT.manifest.")
+    parser.add_argument("--cache", help="Result cache file. Defaults to OUTPUT.cache.sqlite.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not keep a result cache.")
+    parser.add_argument("--restart", action="store_true",
+                        help="Discard the output and manifest of a previous run and start over.")
+    parser.add_argument("--ocr", nargs="+", default=["paddleocr"], help="OCR engine(s) to use.")
+    parser.add_argument("--engine", action="append", default=[], metavar="NAME=MODULE:FUNCTION",
+                        help="Register a custom OCR engine by import path. Repeatable.")
+    parser.add_argument("--ocr-workers", type=int, default=1, help="Pages recognized at the same time.")
+    parser.add_argument("--ai-workers", type=int, default=4, help="AI requests in flight at the same time.")
+    parser.add_argument("--model", default="gemini-2.5-flash", help="Model name.")
+    parser.add_argument("--base-url", default="https://generativelanguage.googleapis.com/v1beta/",
+                        help="OpenAI-compatible API base URL.")
+    parser.add_argument("--api-key", help="API key. Defaults to the MLLM_API_KEY environment variable.")
+    parser.add_argument("--config", help="JSON file with ComiQ configuration such as \"ocr\" and \"ai\".")
+    parser.add_argument("--rpm", type=float, help="Limit AI requests per minute.")
+    parser.add_argument("--tpm", type=float, help="Limit estimated AI tokens per minute.")
+    parser.add_argument("--retries", type=int, metavar="ATTEMPTS",
+                        help="Total attempts per AI request, including the first one "
+                             "(default 5 when rate limiting).")
+    parser.add_argument("--pages-per-request", type=int, default=1,
+                        help="Pack up to this many sparse pages into one AI request.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    for spec in args.engine:
+        name, sep, target = spec.partition("=")
+        if not sep or ":" not in target:
+            print(f"comiq: --engine expects NAME=MODULE:FUNCTION, got {spec!r}", file=sys.stderr)
+            return 2
+        register_ocr_engine(name, target)
+
+    manifest_path = args.manifest or args.output + ".manifest"
+    cache_path = None if args.no_cache else args.cache or args.output + ".cache.sqlite"
+
+    if args.restart:
+        for path in (args.output, manifest_path):
+            if os.path.exists(path):
+                os.remove(path)
+    elif os.path.exists(args.output) and not os.path.exists(manifest_path):
+        print(
+            f"comiq: {args.output} exists but has no manifest; pass --restart to overwrite it.",
+            file=sys.stderr,
+        )
+        return 2
+
+    config = _load_config(args.config)
+    if args.pages_per_request > 1:
+        config.setdefault("multi_page", {})["max_pages"] = args.pages_per_request
+    scheduler = None
+    if args.rpm or args.tpm or args.retries is not None:
+        scheduler_options: Dict[str, Any] = {}
+        if args.retries is not None:
+            scheduler_options["max_attempts"] = max(1, args.retries)
+        scheduler = RequestScheduler(
+            requests_per_minute=args.rpm,
+            tokens_per_minute=args.tpm,
+            **scheduler_options,
+        )
+
+    manifest = JobManifest(manifest_path, args.output)
+    skipped = 0
+    failed = 0
+    done = 0
+    in_flight: Dict[int, PageSource] = {}
+
+    def pages() -> Iterator[bytes]:
+        nonlocal skipped
+        index = 0
+        for page in iter_pages(args.inputs):
+            if page.hash in manifest.done:
+                skipped += 1
+                continue
+            # ComiQ decodes the file once and can send it to the model unchanged;
+            # keep only what the output records.
+            in_flight[index] = page._replace(data=b"")
+            index += 1
+            yield page.data
+
+    try:
+        with ComiQ(
+            api_key=args.api_key,
+            model_name=args.model,
+            base_url=args.base_url,
+            cache=ResultCache(cache_path) if cache_path else None,
+            scheduler=scheduler,
+            **config,
+        ) as client:
+            for result in client.extract_batch(
+                pages(),
+                ocr=args.ocr,
+                ocr_workers=args.ocr_workers,
+                ai_workers=args.ai_workers,
+                ordered=False,
+            ):
+                page = in_flight.pop(result.index)
+                if result.error is not None:
+                    failed += 1
+                    print(f"comiq: {_describe(page)} failed: {result.error!r}", file=sys.stderr)
+                    continue
+                manifest.write(page, result.data)
+                done += 1
+    except KeyboardInterrupt:
+        print("comiq: interrupted; run the same command again to resume.", file=sys.stderr)
+        return 130
+    finally:
+        manifest.close()
+        print(
+            f"comiq: {done} pages done, {skipped} already done, {failed} failed.", file=sys.stderr
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,180 @@
-import cv2
+import asyncio
+import mmap
 import os
-from typing import List, Union, Dict, Any
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import (
+    TYPE_CHECKING, List, Union, Dict, Any, AsyncIterator, BinaryIO, Callable, Iterable,
+    Iterator, NamedTuple, Optional, Tuple,
+)
 import numpy as np
-from dotenv import load_dotenv
-from .ocr import perform_ocr, get_available_ocr_engines
-from .ai_processing import process_with_ai
-from .utils import ai2norm, norm2ai, merge_box_groups, assign_ids_to_bounds, cv2pil
+from .ocr import (
+    perform_ocr, perform_ocr_tiled, get_available_ocr_engines, warm_up_ocr_engines
+)
+from .ai_processing import (
+    process_with_ai, aprocess_with_ai, process_pages_with_ai, aprocess_pages_with_ai,
+    configure_openai, configure_async_openai, build_prompt, encode_ocr_payload, estimate_tokens,
+    encode_original, EncodedImage,
+)
+from .cache import ResultCache, hash_image
+from .metrics import PipelineMetrics
+from .scheduler import RequestScheduler
+from .models import ComicAnalysis
+from .utils import (
+    BoxArray, RegroupRegion, BoxDiff, merge_box_groups, cv2pil, offset_bounds,
+    split_into_windows, split_into_clusters, merge_region_results, assign_ids_to_bounds,
+    diff_boxes, plan_regroup, splice_groups,
+)
 
-load_dotenv()
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+    from PIL import Image
+
+# A page: a path, the bytes of an image file (bytes, a buffer, an mmap or a
+# binary file object), or a decoded BGR array.
+ImageInput = Union[
+    str, "os.PathLike", bytes, bytearray, memoryview, mmap.mmap, BinaryIO, np.ndarray
+]
+
+_dotenv_loaded = False
+
+
+def _load_dotenv():
+    """Loads a .env file into the environment once, when the first ComiQ is created."""
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+_DEFAULT_TILING = {
+    "tile_size": 2048,
+    "overlap": 256,
+    "workers": 1,
+    "ai_window": 4096,
+    "ai_workers": 1,
+}
+
+_DEFAULT_SPLIT = {
+    "max_boxes": 60,
+    "min_gap": 10,
+    "right_to_left": False,
+    "workers": 4,
+}
+
+_DEFAULT_MULTI_PAGE = {
+    "max_pages": 4,
+    "max_boxes": 80,
+    "max_tokens": 8000,
+}
+
+# Tokens assumed for a page image when packing pages without a scheduler.
+_IMAGE_TOKENS = 1500
+
+
+class PageResult(NamedTuple):
+    """The outcome of one page processed by `ComiQ.extract_batch`."""
+    index: int
+    data: Optional[List[Dict[str, Any]]]
+    error: Optional[Exception]
+    metrics: Optional[PipelineMetrics] = None
+
+
+class PageState(NamedTuple):
+    """
+    A page's OCR boxes and their AI grouping, as returned by `ComiQ.extract_state`
+    and `ComiQ.regroup`. The `box_ids` of the groups are positions in `ocr_results`.
+    """
+    data: List[Dict[str, Any]]
+    ocr_results: List[Dict]
+    analysis: ComicAnalysis
+    metrics: Optional[PipelineMetrics] = None
+
+
+class _PageJob(NamedTuple):
+    """Per-call options and instrumentation threaded through the pipeline stages."""
+    use_cache: bool
+    metrics: PipelineMetrics
+
+
+class _AIInput(NamedTuple):
+    """The OCR boxes of one AI request: in pixels, and as prompt dicts on the 0-1000 scale."""
+    boxes: BoxArray
+    ai_bounds: List[Dict]
+
+
+class _PackedPage(NamedTuple):
+    """A recognized page waiting for a multi-page AI request, and the future of its results."""
+    image: np.ndarray
+    ocr_results: List[Dict]
+    job: _PageJob
+    ai_input: _AIInput
+    cache_key: Optional[str]
+    tokens: int
+    future: Any
+
+
+class _SourceArray(np.ndarray):
+    """
+    A decoded page that keeps the file it was decoded from, so the AI request can
+    send that file instead of re-encoding the pixels. Crops and other views of it
+    have no `source`, so only the whole page is sent as is.
+    """
+    source = None
+
+
+class _PagePacker:
+    """
+    Collects recognized pages into multi-page AI requests. A pack is closed when
+    it holds `max_pages` pages, or before the next page would take it over
+    `max_boxes` OCR boxes or `max_tokens` estimated prompt tokens.
+    """
+
+    def __init__(self, max_pages: int, max_boxes: int, max_tokens: int):
+        self.max_pages = max_pages
+        self.max_boxes = max_boxes
+        self.max_tokens = max_tokens
+        self._pages: List[_PackedPage] = []
+        self._boxes = 0
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def add(self, page: _PackedPage) -> List[List[_PackedPage]]:
+        """Adds a page and returns the packs that are ready to send."""
+        boxes = len(page.ai_input.ai_bounds)
+        with self._lock:
+            ready = []
+            if self._pages and (
+                self._boxes + boxes > self.max_boxes or self._tokens + page.tokens > self.max_tokens
+            ):
+                ready.append(self._take_locked())
+            self._pages.append(page)
+            self._boxes += boxes
+            self._tokens += page.tokens
+            if len(self._pages) >= self.max_pages:
+                ready.append(self._take_locked())
+            return ready
+
+    def flush(self) -> List[List[_PackedPage]]:
+        """Returns the pages collected so far as a pack, if there are any."""
+        with self._lock:
+            return [self._take_locked()] if self._pages else []
+
+    def _take_locked(self) -> List[_PackedPage]:
+        pack, self._pages = self._pages, []
+        self._boxes = self._tokens = 0
+        return pack
+
+
+def _chain_future(source: Future, target: Future):
+    """Copies the outcome of `source` into `target`."""
+    try:
+        target.set_result(source.result())
+    except Exception as e:
+        target.set_exception(e)
 
 
 class ComiQ:
@@ -20,6 +187,14 @@ class ComiQ:
         api_key: str = None,
         model_name: str = "gemini-2.5-flash",
         base_url: str = "https://generativelanguage.googleapis.com/v1beta/",
+        client: Optional["OpenAI"] = None,
+        async_client: Optional["AsyncOpenAI"] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        pool_limits: Optional[Dict[str, Any]] = None,
+        cache: Union[ResultCache, str, None] = None,
+        metrics_callback: Optional[Callable[[PipelineMetrics], None]] = None,
+        scheduler: Union[RequestScheduler, Dict[str, Any], None] = None,
         **kwargs,
     ):
         """
@@ -30,10 +205,34 @@ class ComiQ:
                                      it's sourced from the GEMINI_API_KEY environment variable.
             model_name (str): The name of the AI model to use.
             base_url (str): The base URL for the AI service.
+            client (OpenAI, optional): A client to use for all AI requests instead of
+                                       the one ComiQ creates. It is not closed by `close()`.
+            async_client (AsyncOpenAI, optional): The same, for the asynchronous methods. Its
+                                                  connection pool is bound to one event loop,
+                                                  so call them from that loop only.
+            timeout (float, optional): Request timeout in seconds for the created clients.
+            max_retries (int, optional): Retry count for the created clients.
+            pool_limits (dict, optional): Connection pool limits for the created clients,
+                                          passed to `httpx.Limits`.
+            cache (ResultCache or str, optional): A result cache, or the path of the SQLite
+                                                  file to create one at. Cached OCR results and
+                                                  AI groupings are reused for unchanged pages.
+            metrics_callback (callable, optional): Called with the `PipelineMetrics` of every
+                                                   page once it is done, including failed pages.
+                                                   See `comiq.metrics.metrics_logger`.
+            scheduler (RequestScheduler or dict, optional): Rate limiting, retries and
+                                                            response repair for the AI
+                                                            requests, or the arguments to
+                                                            create a `RequestScheduler`.
+                                                            Clients created by ComiQ then
+                                                            default to `max_retries=0`
+                                                            unless the scheduler makes a
+                                                            single attempt.
             **kwargs: Additional configuration for AI and OCR.
         """
+        _load_dotenv()
         self.api_key = api_key or os.getenv("MLLM_API_KEY")
-        if not self.api_key:
+        if not self.api_key and client is None and async_client is None:
             raise ValueError(
                 "API key not provided. Please pass it to the constructor or set the "
                 "MLLM_API_KEY environment variable."
@@ -41,29 +240,105 @@ class ComiQ:
         self.model_name = model_name
         self.base_url = base_url
         self.config = kwargs
+        self.cache = ResultCache(cache) if isinstance(cache, str) else cache
+        self.metrics_callback = metrics_callback
+        self.scheduler = RequestScheduler(**scheduler) if isinstance(scheduler, dict) else scheduler
+        if self.scheduler is not None and self.scheduler.max_attempts > 1 and max_retries is None:
+            # The scheduler retries; retrying in the client as well would multiply the attempts.
+            max_retries = 0
 
-    def extract(
-        self,
-        image: Union[str, np.ndarray],
-        ocr: Union[str, List[str]] = "paddleocr",
-    ) -> Dict[str, Any]:
-        """
-        Extracts text from the given image using specified OCR method(s) and processes it with AI.
+        self._client_options = {
+            "timeout": timeout,
+            "max_retries": max_retries,
+            "pool_limits": pool_limits,
+        }
+        self._client = client
+        self._async_client = async_client
+        self._owns_client = client is None
+        self._owns_async_client = async_client is None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_lock = threading.Lock()
 
-        Args:
-            image (str or numpy.ndarray): Path to the image file or a numpy array of the image.
-            ocr (str or list): The OCR method(s) to use.
+    def _check_api_key(self, asynchronous: bool):
+        """Raises before any work is done if the client for a request cannot be created."""
+        owns = self._owns_async_client if asynchronous else self._owns_client
+        if owns and not self.api_key:
+            names = ("async_client", "client") if asynchronous else ("client", "async_client")
+            missing, injected = names
+            raise ValueError(
+                f"API key not provided. ComiQ needs one to create the `{missing}` for this "
+                f"call, because only `{injected}` was passed. Pass `{missing}` or an API key "
+                "to the constructor, or set the MLLM_API_KEY environment variable."
+            )
 
-        Returns:
-            dict: Processed data containing text extractions and their locations.
+    @property
+    def client(self) -> "OpenAI":
+        """The long-lived client shared by every synchronous AI request."""
+        if self._client is None:
+            self._check_api_key(asynchronous=False)
+            with self._client_lock:
+                if self._client is None:
+                    self._client = configure_openai(
+                        self.api_key, self.base_url, **self._client_options
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        """
+        The long-lived client shared by every asynchronous AI request on the
+        running event loop. A client created by ComiQ keeps its connection pool on
+        the loop that first used it, so it is replaced when called from another
+        loop, e.g. a second `asyncio.run()`.
         """
-        # Load the image
-        if isinstance(image, str):
-            image = cv2.imread(image)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if self._owns_async_client and self._async_client is not None and loop is not None \
+                and self._async_client_loop is not loop:
+            with self._client_lock:
+                if self._async_client_loop is not loop:
+                    # The old pool cannot be closed from here: its loop is usually
+                    # closed already, and otherwise it is not the running one.
+                    self._async_client = None
+        if self._async_client is None:
+            self._check_api_key(asynchronous=True)
+            with self._client_lock:
+                if self._async_client is None:
+                    self._async_client = configure_async_openai(
+                        self.api_key, self.base_url, **self._client_options
+                    )
+                    self._async_client_loop = loop
+        return self._async_client
 
-        height, width = image.shape[:2]
+    def close(self):
+        """Closes the synchronous client created by this instance."""
+        if self._owns_client and self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        """Closes both clients created by this instance."""
+        self.close()
+        if self._owns_async_client and self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_client_loop = None
 
-        # Perform OCR
+    def __enter__(self) -> "ComiQ":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self) -> "ComiQ":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    def _resolve_ocr_methods(self, ocr: Union[str, List[str]]) -> List[str]:
         if isinstance(ocr, str):
             ocr = [ocr]
 
@@ -73,27 +348,1213 @@ class ComiQ:
             raise ValueError(
                 f"Invalid OCR engine requested. Available options: {available_ocr}"
             )
+        return ocr_methods
 
-        ocr_config = self.config.get("ocr", {})
-        ocr_results = perform_ocr(image, ocr_methods, **ocr_config)
+    def warm_up(self, ocr: Union[str, List[str]] = "paddleocr"):
+        """
+        Loads the OCR engine(s) with this instance's configuration so the first
+        call to `extract` does not pay the model loading cost.
+
+        Args:
+            ocr (str or list): The OCR method(s) to load.
+        """
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        warm_up_ocr_engines(ocr_methods, **self.config.get("ocr", {}))
+
+    def _finish_job(self, job: _PageJob):
+        job.metrics.finish()
+        if self.metrics_callback is not None:
+            self.metrics_callback(job.metrics)
+
+    def _load_image(self, image: ImageInput) -> np.ndarray:
+        """
+        Decodes a page once. Bytes, buffers and mmaps are decoded in place, and
+        the file is kept with the pixels for `_ai_image`.
+        """
+        if isinstance(image, np.ndarray):
+            return image
+        import cv2
 
-        # Normalize data for AI processing
-        ocr_results_ai = norm2ai(ocr_results, height, width)
-        ocr_bound_ids = assign_ids_to_bounds(ocr_results_ai)
+        if isinstance(image, (str, os.PathLike)):
+            name = os.fspath(image)
+            try:
+                data = np.fromfile(name, dtype=np.uint8)
+            except OSError as e:
+                raise ValueError(f"Could not read image: {name}") from e
+        elif isinstance(image, (bytes, bytearray, memoryview, mmap.mmap)):
+            # Checked before file objects: an mmap has `read()` too, but reading
+            # would copy it and move its position.
+            name = f"{type(image).__name__} input"
+            data = image
+        elif hasattr(image, "read"):
+            name = getattr(image, "name", "file object")
+            data = image.read()
+        else:
+            name = f"{type(image).__name__} input"
+            data = image
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        decoded = cv2.imdecode(buffer, cv2.IMREAD_COLOR) if buffer.size else None
+        if decoded is None:
+            raise ValueError(f"Could not read image: {name}")
+        page = decoded.view(_SourceArray)
+        page.source = data
+        return page
 
-        # Process with AI
+    def _ai_config(self) -> Dict[str, Any]:
+        """
+        The "ai" configuration for `process_with_ai`, without the `passthrough`
+        image option, which only `_ai_image` uses.
+        """
         ai_config = self.config.get("ai", {})
+        encoding = ai_config.get("image_encoding")
+        if encoding and "passthrough" in encoding:
+            encoding = {key: value for key, value in encoding.items() if key != "passthrough"}
+            ai_config = {**ai_config, "image_encoding": encoding}
+        return ai_config
+
+    def _ai_image(self, image: np.ndarray, job: _PageJob) -> Union["Image.Image", EncodedImage]:
+        """
+        Returns the original file of a whole page if it can be sent as is (see
+        `encode_original`), otherwise the pixels as a PIL image to be encoded.
+        """
+        source = getattr(image, "source", None)
+        encoding = dict(self.config.get("ai", {}).get("image_encoding") or {})
+        if source is not None and encoding.pop("passthrough", True):
+            height, width = image.shape[:2]
+            encoded = encode_original(source, width, height, **encoding)
+            if encoded is not None:
+                job.metrics.count("image_passthrough")
+                return encoded
+        with job.metrics.stage("encode"):
+            return cv2pil(image)
+
+    def _tiling_config(self, image: np.ndarray) -> Optional[Dict[str, Any]]:
+        """Returns the tiling settings if tiling is configured and the image needs it."""
+        tiling = self.config.get("tiling")
+        if tiling is None:
+            return None
+        tiling = {**_DEFAULT_TILING, **tiling}
+        if max(image.shape[:2]) <= tiling["tile_size"]:
+            return None
+        return tiling
+
+    def _run_ocr(
+        self, image: np.ndarray, ocr_methods: List[str], job: _PageJob
+    ) -> List[Dict]:
+        """Runs OCR and returns the detected boxes in image coordinates."""
+        ocr_config = self.config.get("ocr", {})
+        tiling = self._tiling_config(image)
+
+        ocr_results = None
+        if self.cache is not None:
+            key_config = ocr_config if tiling is None else {**ocr_config, "tiling": tiling}
+            cache_key = ResultCache.ocr_key(hash_image(image), ocr_methods, key_config)
+            if job.use_cache:
+                with job.metrics.stage("cache"):
+                    ocr_results = self.cache.get_ocr(cache_key)
+                if ocr_results is not None:
+                    job.metrics.count("ocr_cache_hits")
+        if ocr_results is None:
+            if tiling is None:
+                ocr_results = perform_ocr(image, ocr_methods, metrics=job.metrics, **ocr_config)
+            else:
+                ocr_results = perform_ocr_tiled(
+                    image,
+                    ocr_methods,
+                    tile_size=tiling["tile_size"],
+                    overlap=tiling["overlap"],
+                    workers=tiling["workers"],
+                    metrics=job.metrics,
+                    **ocr_config,
+                )
+            if self.cache is not None:
+                self.cache.set_ocr(cache_key, ocr_results)
+        job.metrics.count("ocr_boxes", len(ocr_results))
+        return ocr_results
+
+    def _ocr_stage(
+        self, image: ImageInput, ocr_methods: List[str], job: _PageJob
+    ) -> Tuple[np.ndarray, List[Dict]]:
+        with job.metrics.stage("load"):
+            image = self._load_image(image)
+        return image, self._run_ocr(image, ocr_methods, job)
+
+    def _ai_regions(
+        self, image: np.ndarray, ocr_results: List[Dict]
+    ) -> Optional[List[Tuple[Tuple[int, int, int, int], List[Dict]]]]:
+        """
+        Splits a page into regions for separate AI requests: windows of a tall
+        page, and spatial clusters of a dense page or window, if configured.
+        """
+        height, width = image.shape[:2]
+        regions = None
+        tiling = self.config.get("tiling")
+        if tiling is not None:
+            window = {**_DEFAULT_TILING, **tiling}["ai_window"]
+            if window and height > window:
+                regions = split_into_windows(ocr_results, height, width, window)
+
+        split = self.config.get("split")
+        if split is not None:
+            split = {**_DEFAULT_SPLIT, **split}
+            clusters = []
+            for region, bounds in regions or [((0, 0, height, width), ocr_results)]:
+                clusters.extend(
+                    split_into_clusters(
+                        bounds,
+                        region,
+                        max_boxes=split["max_boxes"],
+                        min_gap=split["min_gap"],
+                        right_to_left=split["right_to_left"],
+                    )
+                )
+            if len(clusters) > 1:
+                regions = clusters
+        return regions
+
+    def _ai_workers(self) -> int:
+        """Number of AI requests for the regions of one page that run at the same time."""
+        split = self.config.get("split")
+        if split is not None:
+            return {**_DEFAULT_SPLIT, **split}["workers"]
+        return {**_DEFAULT_TILING, **self.config.get("tiling", {})}["ai_workers"]
+
+    def _ai_cache_lookup(
+        self, image: np.ndarray, ai_input: _AIInput, use_cache: bool
+    ) -> Tuple[Optional[str], Optional[ComicAnalysis]]:
+        """Returns the AI cache key for a page and the cached grouping, if any."""
+        if self.cache is None:
+            return None, None
+        cache_key = ResultCache.ai_key(
+            hash_image(image),
+            ai_input.ai_bounds,
+            build_prompt([], self.config.get("ai", {}).get("ocr_format", "legacy")),
+            self.model_name,
+            {"base_url": self.base_url, **self.config.get("ai", {})},
+        )
+        return cache_key, self.cache.get_ai(cache_key) if use_cache else None
+
+    def _run_ai(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> List[Dict[str, Any]]:
+        """Groups the OCR boxes with the AI model, one request per region of the page."""
+        regions = self._ai_regions(image, ocr_results)
+        if regions is None:
+            return self._analyze(image, ocr_results, job)
+        job.metrics.count("ai_regions", len(regions))
+
+        def analyze(region):
+            return self._analyze_region(image, region, job)
+
+        workers = self._ai_workers()
+        if workers > 1 and len(regions) > 1:
+            with ThreadPoolExecutor(workers, thread_name_prefix="comiq-window") as pool:
+                results = list(pool.map(analyze, regions))
+        else:
+            results = [analyze(region) for region in regions]
+        return merge_region_results([(box, result) for (box, _), result in zip(regions, results)])
+
+    async def _arun_ai(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> List[Dict[str, Any]]:
+        regions = self._ai_regions(image, ocr_results)
+        if regions is None:
+            return await self._aanalyze(image, ocr_results, job)
+        job.metrics.count("ai_regions", len(regions))
+
+        workers = self._ai_workers()
+        semaphore = asyncio.Semaphore(max(1, workers))
+
+        async def analyze(region):
+            async with semaphore:
+                return await self._aanalyze_region(image, region, job)
+
+        results = await asyncio.gather(*(analyze(region) for region in regions))
+        return merge_region_results([(box, result) for (box, _), result in zip(regions, results)])
+
+    def _analyze_region(
+        self,
+        image: np.ndarray,
+        region: Tuple[Tuple[int, int, int, int], List[Dict]],
+        job: _PageJob,
+    ) -> List[Dict[str, Any]]:
+        """Analyzes a crop of the page; the results are in crop coordinates."""
+        (ymin, xmin, ymax, xmax), bounds = region
+        crop = image[ymin:ymax, xmin:xmax]
+        return self._analyze(crop, offset_bounds(bounds, -ymin, -xmin), job)
+
+    async def _aanalyze_region(
+        self,
+        image: np.ndarray,
+        region: Tuple[Tuple[int, int, int, int], List[Dict]],
+        job: _PageJob,
+    ) -> List[Dict[str, Any]]:
+        (ymin, xmin, ymax, xmax), bounds = region
+        crop = image[ymin:ymax, xmin:xmax]
+        return await self._aanalyze(crop, offset_bounds(bounds, -ymin, -xmin), job)
+
+    def _prepare_ai_input(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> _AIInput:
+        """Assigns the box IDs and normalizes the boxes to the AI scale."""
+        height, width = image.shape[:2]
+        with job.metrics.stage("norm2ai"):
+            boxes = BoxArray.from_bounds(ocr_results)
+            return _AIInput(boxes, boxes.normalized(height, width).to_bounds())
+
+    def _analyze(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> List[Dict[str, Any]]:
+        """Sends one image and its boxes to the AI model and merges the groups."""
+        predicted_groups, ai_input = self._group(image, ocr_results, job)
+        return self._finalize(image, predicted_groups, ai_input, job)
+
+    async def _aanalyze(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> List[Dict[str, Any]]:
+        predicted_groups, ai_input = await self._agroup(image, ocr_results, job)
+        return self._finalize(image, predicted_groups, ai_input, job)
+
+    def _group(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> Tuple[ComicAnalysis, _AIInput]:
+        """Returns the AI grouping of one image's boxes, from the cache or the model."""
+        ai_input = self._prepare_ai_input(image, ocr_results, job)
+        with job.metrics.stage("cache"):
+            cache_key, predicted_groups = self._ai_cache_lookup(image, ai_input, job.use_cache)
+        if predicted_groups is not None:
+            job.metrics.count("ai_cache_hits")
+            return predicted_groups, ai_input
+
+        ai_config = self._ai_config()
+        ai_image = self._ai_image(image, job)
         predicted_groups = process_with_ai(
-            image=cv2pil(image),
-            ocr_results=ocr_bound_ids,
+            image=ai_image,
+            ocr_results=ai_input.ai_bounds,
             mllm_api_key=self.api_key,
             model_name=self.model_name,
             base_url=self.base_url,
+            client=self.client,
+            metrics=job.metrics,
+            scheduler=self.scheduler,
             **ai_config,
         )
+        if cache_key is not None:
+            self.cache.set_ai(cache_key, predicted_groups)
+        return predicted_groups, ai_input
 
-        # Merge results and convert coordinates back
-        merged_results = merge_box_groups(predicted_groups, ocr_bound_ids)
-        final_results = ai2norm(merged_results, height, width)
+    async def _agroup(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> Tuple[ComicAnalysis, _AIInput]:
+        ai_input = self._prepare_ai_input(image, ocr_results, job)
+        loop = asyncio.get_running_loop()
+        with job.metrics.stage("cache"):
+            cache_key, predicted_groups = await loop.run_in_executor(
+                None, self._ai_cache_lookup, image, ai_input, job.use_cache
+            )
+        if predicted_groups is not None:
+            job.metrics.count("ai_cache_hits")
+            return predicted_groups, ai_input
 
+        ai_config = self._ai_config()
+        ai_image = await loop.run_in_executor(None, self._ai_image, image, job)
+        predicted_groups = await aprocess_with_ai(
+            image=ai_image,
+            ocr_results=ai_input.ai_bounds,
+            mllm_api_key=self.api_key,
+            model_name=self.model_name,
+            base_url=self.base_url,
+            client=self.async_client,
+            metrics=job.metrics,
+            scheduler=self.scheduler,
+            **ai_config,
+        )
+        if cache_key is not None:
+            await loop.run_in_executor(None, self.cache.set_ai, cache_key, predicted_groups)
+        return predicted_groups, ai_input
+
+    def _stream_analyze(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> Iterator[Dict[str, Any]]:
+        """Like `_analyze`, but yields each merged group as soon as the model completes it."""
+        ai_input = self._prepare_ai_input(image, ocr_results, job)
+        with job.metrics.stage("cache"):
+            cache_key, predicted_groups = self._ai_cache_lookup(image, ai_input, job.use_cache)
+        if predicted_groups is not None:
+            job.metrics.count("ai_cache_hits")
+            yield from self._finalize(image, predicted_groups, ai_input, job)
+            return
+
+        ai_config = self._ai_config()
+        ai_image = self._ai_image(image, job)
+        groups = []
+        for group in process_with_ai(
+            image=ai_image,
+            ocr_results=ai_input.ai_bounds,
+            mllm_api_key=self.api_key,
+            model_name=self.model_name,
+            base_url=self.base_url,
+            client=self.client,
+            metrics=job.metrics,
+            scheduler=self.scheduler,
+            stream=True,
+            **ai_config,
+        ):
+            groups.append(group)
+            yield from self._finalize(image, ComicAnalysis(groups=[group]), ai_input, job)
+        if cache_key is not None:
+            self.cache.set_ai(cache_key, ComicAnalysis(groups=groups))
+
+    async def _astream_analyze(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob
+    ) -> AsyncIterator[Dict[str, Any]]:
+        ai_input = self._prepare_ai_input(image, ocr_results, job)
+        loop = asyncio.get_running_loop()
+        with job.metrics.stage("cache"):
+            cache_key, predicted_groups = await loop.run_in_executor(
+                None, self._ai_cache_lookup, image, ai_input, job.use_cache
+            )
+        if predicted_groups is not None:
+            job.metrics.count("ai_cache_hits")
+            for result in self._finalize(image, predicted_groups, ai_input, job):
+                yield result
+            return
+
+        ai_config = self._ai_config()
+        ai_image = await loop.run_in_executor(None, self._ai_image, image, job)
+        groups = []
+        stream = await aprocess_with_ai(
+            image=ai_image,
+            ocr_results=ai_input.ai_bounds,
+            mllm_api_key=self.api_key,
+            model_name=self.model_name,
+            base_url=self.base_url,
+            client=self.async_client,
+            metrics=job.metrics,
+            scheduler=self.scheduler,
+            stream=True,
+            **ai_config,
+        )
+        async for group in stream:
+            groups.append(group)
+            for result in self._finalize(image, ComicAnalysis(groups=[group]), ai_input, job):
+                yield result
+        if cache_key is not None:
+            await loop.run_in_executor(
+                None, self.cache.set_ai, cache_key, ComicAnalysis(groups=groups)
+            )
+
+    def _finalize(
+        self,
+        image: np.ndarray,
+        predicted_groups: ComicAnalysis,
+        ai_input: _AIInput,
+        job: _PageJob,
+    ) -> List[Dict[str, Any]]:
+        # Group bounds come from the original pixel boxes, so no precision is lost
+        # converting back from the 0-1000 scale.
+        with job.metrics.stage("merge"):
+            final_results = merge_box_groups(predicted_groups, ai_input.boxes)
+        job.metrics.count("groups", len(final_results))
         return final_results
+
+    def _multi_page_config(self) -> Optional[Dict[str, Any]]:
+        """Returns the multi-page request settings if they are configured and enabled."""
+        multi_page = self.config.get("multi_page")
+        if multi_page is None:
+            return None
+        multi_page = {**_DEFAULT_MULTI_PAGE, **multi_page}
+        return multi_page if multi_page["max_pages"] > 1 else None
+
+    def _page_packer(self) -> Optional[_PagePacker]:
+        """Returns a packer for multi-page AI requests if `multi_page` is configured."""
+        multi_page = self._multi_page_config()
+        if multi_page is None:
+            return None
+        return _PagePacker(
+            multi_page["max_pages"], multi_page["max_boxes"], multi_page["max_tokens"]
+        )
+
+    def _pack_candidate(
+        self, image: np.ndarray, ocr_results: List[Dict], job: _PageJob, packer: _PagePacker
+    ) -> Optional[Tuple[_AIInput, Optional[str], int]]:
+        """
+        Prepares a page for a multi-page AI request and returns its AI input, cache key
+        and estimated tokens. Returns None if the page is sent on its own instead:
+        when it is split into regions, its grouping is cached, or it has too much text.
+        """
+        if len(ocr_results) > packer.max_boxes or self._ai_regions(image, ocr_results) is not None:
+            return None
+        ai_input = self._prepare_ai_input(image, ocr_results, job)
+        with job.metrics.stage("cache"):
+            cache_key, cached = self._ai_cache_lookup(image, ai_input, job.use_cache)
+        if cached is not None:
+            return None
+        ocr_format = self.config.get("ai", {}).get("ocr_format", "legacy")
+        image_tokens = _IMAGE_TOKENS if self.scheduler is None else self.scheduler.image_tokens
+        tokens = estimate_tokens(encode_ocr_payload(ai_input.ai_bounds, ocr_format)) + image_tokens
+        if tokens > packer.max_tokens:
+            return None
+        return ai_input, cache_key, tokens
+
+    def _finish_pack(
+        self, pack: List[_PackedPage], analyses: List[ComicAnalysis]
+    ) -> List[List[Dict[str, Any]]]:
+        results = []
+        for page, analysis in zip(pack, analyses):
+            if page.cache_key is not None:
+                self.cache.set_ai(page.cache_key, analysis)
+            results.append(self._finalize(page.image, analysis, page.ai_input, page.job))
+        return results
+
+    def _analyze_pages(self, pack: List[_PackedPage]) -> List[List[Dict[str, Any]]]:
+        """Sends several pages in one AI request and merges the groups of each page."""
+        ai_config = self._ai_config()
+        images = []
+        for page in pack:
+            images.append(self._ai_image(page.image, page.job))
+        shared = PipelineMetrics()
+        try:
+            analyses = process_pages_with_ai(
+                images=images,
+                ocr_results=[page.ai_input.ai_bounds for page in pack],
+                mllm_api_key=self.api_key,
+                model_name=self.model_name,
+                base_url=self.base_url,
+                client=self.client,
+                metrics=shared,
+                scheduler=self.scheduler,
+                **ai_config,
+            )
+        finally:
+            for i, page in enumerate(pack):
+                page.job.metrics.add_share(shared, i, len(pack))
+                page.job.metrics.count("pages_per_request", len(pack))
+        return self._finish_pack(pack, analyses)
+
+    async def _aanalyze_pages(self, pack: List[_PackedPage]) -> List[List[Dict[str, Any]]]:
+        ai_config = self._ai_config()
+        loop = asyncio.get_running_loop()
+        images = []
+        for page in pack:
+            # Converting or base64-encoding a page is CPU bound; keep it off the event loop.
+            images.append(await loop.run_in_executor(None, self._ai_image, page.image, page.job))
+        shared = PipelineMetrics()
+        try:
+            analyses = await aprocess_pages_with_ai(
+                images=images,
+                ocr_results=[page.ai_input.ai_bounds for page in pack],
+                mllm_api_key=self.api_key,
+                model_name=self.model_name,
+                base_url=self.base_url,
+                client=self.async_client,
+                metrics=shared,
+                scheduler=self.scheduler,
+                **ai_config,
+            )
+        finally:
+            for i, page in enumerate(pack):
+                page.job.metrics.add_share(shared, i, len(pack))
+                page.job.metrics.count("pages_per_request", len(pack))
+        return await loop.run_in_executor(None, self._finish_pack, pack, analyses)
+
+    def _run_ai_pack(self, pack: List[_PackedPage]):
+        """
+        Runs the AI stage for a pack of pages and completes their futures. If the
+        combined response cannot be parsed, the pages are sent again one by one.
+        """
+        if len(pack) > 1:
+            try:
+                results = self._analyze_pages(pack)
+            except ValueError:
+                pass
+            except Exception as e:
+                for page in pack:
+                    page.future.set_exception(e)
+                return
+            else:
+                for page, result in zip(pack, results):
+                    page.future.set_result(result)
+                return
+        for page in pack:
+            try:
+                page.future.set_result(self._run_ai(page.image, page.ocr_results, page.job))
+            except Exception as e:
+                page.future.set_exception(e)
+
+    async def _arun_ai_pack(self, pack: List[_PackedPage]):
+        if len(pack) > 1:
+            try:
+                results = await self._aanalyze_pages(pack)
+            except ValueError:
+                pass
+            except Exception as e:
+                for page in pack:
+                    if not page.future.done():
+                        page.future.set_exception(e)
+                return
+            else:
+                for page, result in zip(pack, results):
+                    if not page.future.done():
+                        page.future.set_result(result)
+                return
+        for page in pack:
+            try:
+                result = await self._arun_ai(page.image, page.ocr_results, page.job)
+            except Exception as e:
+                if not page.future.done():
+                    page.future.set_exception(e)
+            else:
+                if not page.future.done():
+                    page.future.set_result(result)
+
+    def extract(
+        self,
+        image: ImageInput,
+        ocr: Union[str, List[str]] = "paddleocr",
+        use_cache: bool = True,
+        return_metrics: bool = False,
+    ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], PipelineMetrics]]:
+        """
+        Extracts text from the given image using specified OCR method(s) and processes it with AI.
+
+        Args:
+            image (str, bytes or numpy.ndarray): Path to the image file, the contents of
+                                                 one (bytes, a buffer, an mmap or a binary
+                                                 file object), or a numpy array of the image.
+            ocr (str or list): The OCR method(s) to use.
+            use_cache (bool): Read from the result cache, if one is configured. When False
+                              the page is recomputed and the cache entries are refreshed.
+            return_metrics (bool): Also return the `PipelineMetrics` collected for the page.
+
+        Returns:
+            list: Processed data containing text extractions and their locations, or a
+                  (data, metrics) tuple if `return_metrics` is True.
+        """
+        self._check_api_key(asynchronous=False)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            image, ocr_results = self._ocr_stage(image, ocr_methods, job)
+            data = self._run_ai(image, ocr_results, job)
+        finally:
+            self._finish_job(job)
+        return (data, job.metrics) if return_metrics else data
+
+    def extract_state(
+        self,
+        image: ImageInput,
+        ocr: Union[str, List[str]] = "paddleocr",
+        use_cache: bool = True,
+    ) -> PageState:
+        """
+        Like `extract`, but returns a `PageState` that `regroup` can update when
+        the page's OCR boxes change. The page is grouped in one AI request, even
+        if `split` or `tiling` windows are configured.
+
+        Args:
+            image (str, bytes or numpy.ndarray): The page, as accepted by `extract`.
+            ocr (str or list): The OCR method(s) to use.
+            use_cache (bool): Read from the result cache, if one is configured.
+
+        Returns:
+            PageState: The extracted data with the OCR boxes, grouping and metrics.
+        """
+        self._check_api_key(asynchronous=False)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            image, ocr_results = self._ocr_stage(image, ocr_methods, job)
+            ocr_results = assign_ids_to_bounds(ocr_results)
+            analysis, ai_input = self._group(image, ocr_results, job)
+            data = self._finalize(image, analysis, ai_input, job)
+        finally:
+            self._finish_job(job)
+        return PageState(data, ocr_results, analysis, job.metrics)
+
+    def regroup(
+        self,
+        image: ImageInput,
+        state: PageState,
+        ocr_results: List[Dict],
+        context: float = 60,
+        use_cache: bool = True,
+    ) -> PageState:
+        """
+        Updates a page's grouping after some of its OCR boxes changed, for example
+        after new OCR settings or manual fixes, without grouping the whole page again.
+
+        The boxes are compared with `state.ocr_results`. Only the areas around the
+        added and removed boxes are sent to the AI model, with the unchanged boxes
+        nearby as context, and the answers replace the groups they affect. Other
+        groups keep their text and ids. Nothing is sent if no box changed.
+
+        Args:
+            image (str, bytes or numpy.ndarray): The page, as accepted by `extract`.
+            state (PageState): The result of `extract_state` or of an earlier `regroup`.
+            ocr_results (list): All OCR boxes of the page now, as `{"text_box", "text"}`
+                                dicts in pixels.
+            context (float): Margin around each changed box, on a 0-1000 scale of the
+                             page size.
+            use_cache (bool): Read from the result cache, if one is configured.
+
+        Returns:
+            PageState: The updated page. Its metrics count the `regroup_regions` sent.
+        """
+        self._check_api_key(asynchronous=False)
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            with job.metrics.stage("load"):
+                image = self._load_image(image)
+            ocr_results, diff, regions = self._plan_regroup(
+                image, state, ocr_results, context, job
+            )
+
+            def answer(region: RegroupRegion) -> Optional[ComicAnalysis]:
+                return self._regroup_region(image, ocr_results, region, job)
+
+            workers = self._ai_workers()
+            if workers > 1 and len(regions) > 1:
+                with ThreadPoolExecutor(workers, thread_name_prefix="comiq-regroup") as pool:
+                    answers = list(pool.map(answer, regions))
+            else:
+                answers = [answer(region) for region in regions]
+            analysis, data = self._splice(image, state, ocr_results, diff, regions, answers, job)
+        finally:
+            self._finish_job(job)
+        return PageState(data, ocr_results, analysis, job.metrics)
+
+    def _plan_regroup(
+        self,
+        image: np.ndarray,
+        state: PageState,
+        ocr_results: List[Dict],
+        context: float,
+        job: _PageJob,
+    ) -> Tuple[List[Dict], BoxDiff, List[RegroupRegion]]:
+        """Numbers the new boxes, diffs them with the state and finds the regions to send."""
+        ocr_results = assign_ids_to_bounds(ocr_results)
+        height, width = image.shape[:2]
+        with job.metrics.stage("diff"):
+            diff = diff_boxes(state.ocr_results, ocr_results)
+            regions = plan_regroup(
+                state.analysis, state.ocr_results, ocr_results, diff, height, width, context
+            )
+        job.metrics.count("ocr_boxes", len(ocr_results))
+        job.metrics.count("regroup_regions", sum(1 for region in regions if region.boxes))
+        return ocr_results, diff, regions
+
+    def _region_input(
+        self, image: np.ndarray, ocr_results: List[Dict], region: RegroupRegion
+    ) -> Tuple[np.ndarray, List[Dict]]:
+        """The crop of a region and its boxes in crop coordinates, keeping their page ids."""
+        ymin, xmin, ymax, xmax = region.crop
+        bounds = [ocr_results[i] for i in region.boxes]
+        return image[ymin:ymax, xmin:xmax], offset_bounds(bounds, -ymin, -xmin)
+
+    def _regroup_region(
+        self, image: np.ndarray, ocr_results: List[Dict], region: RegroupRegion, job: _PageJob
+    ) -> Optional[ComicAnalysis]:
+        if not region.boxes:
+            return None
+        crop, bounds = self._region_input(image, ocr_results, region)
+        return self._group(crop, bounds, job)[0]
+
+    def _splice(
+        self,
+        image: np.ndarray,
+        state: PageState,
+        ocr_results: List[Dict],
+        diff: BoxDiff,
+        regions: List[RegroupRegion],
+        answers: List[Optional[ComicAnalysis]],
+        job: _PageJob,
+    ) -> Tuple[ComicAnalysis, List[Dict[str, Any]]]:
+        analysis = splice_groups(
+            state.analysis, diff, regions, answers, state.ocr_results, ocr_results
+        )
+        ai_input = _AIInput(BoxArray.from_bounds(ocr_results), [])
+        return analysis, self._finalize(image, analysis, ai_input, job)
+
+    def extract_stream(
+        self,
+        image: ImageInput,
+        ocr: Union[str, List[str]] = "paddleocr",
+        use_cache: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Like `extract`, but streams the AI response and yields each text group as
+        soon as the model has finished writing it, instead of waiting for the
+        whole page.
+
+        When the page is split into several AI requests (`tiling` or `split`),
+        the requests run concurrently and their groups are yielded in page order
+        as each request completes.
+
+        Args:
+            image (str, bytes or numpy.ndarray): Path to the image file, the contents of
+                                                 one (bytes, a buffer, an mmap or a binary
+                                                 file object), or a numpy array of the image.
+            ocr (str or list): The OCR method(s) to use.
+            use_cache (bool): Read from the result cache, if one is configured.
+
+        Yields:
+            dict: One text group, in the same format as the items returned by `extract`.
+        """
+        self._check_api_key(asynchronous=False)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        return self._iter_stream(image, ocr_methods, use_cache)
+
+    def _iter_stream(
+        self, image: ImageInput, ocr_methods: List[str], use_cache: bool
+    ) -> Iterator[Dict[str, Any]]:
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            image, ocr_results = self._ocr_stage(image, ocr_methods, job)
+            regions = self._ai_regions(image, ocr_results)
+            if regions is None:
+                yield from self._stream_analyze(image, ocr_results, job)
+                return
+
+            job.metrics.count("ai_regions", len(regions))
+            pool = ThreadPoolExecutor(max(1, self._ai_workers()), thread_name_prefix="comiq-window")
+            futures = [pool.submit(self._analyze_region, image, region, job) for region in regions]
+            try:
+                parts = []
+                delivered = 0
+                for (box, _), future in zip(regions, futures):
+                    parts.append((box, future.result()))
+                    merged = merge_region_results(parts)
+                    yield from merged[delivered:]
+                    delivered = len(merged)
+            finally:
+                for future in futures:
+                    future.cancel()
+                pool.shutdown(wait=False)
+        finally:
+            self._finish_job(job)
+
+    def extract_batch(
+        self,
+        images: Iterable[ImageInput],
+        ocr: Union[str, List[str]] = "paddleocr",
+        ocr_workers: int = 1,
+        ai_workers: int = 4,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> Iterator[PageResult]:
+        """
+        Extracts text from many images, overlapping the OCR of upcoming pages with
+        the AI requests of pages that are already recognized.
+
+        Args:
+            images (iterable): Pages as accepted by `extract`. Consumed lazily.
+            ocr (str or list): The OCR method(s) to use.
+            ocr_workers (int): Number of pages recognized at the same time.
+            ai_workers (int): Number of AI requests in flight at the same time.
+            ordered (bool): Yield results in input order. If False, results are
+                            yielded as soon as each page completes.
+            max_pending (int, optional): Upper bound on pages held in memory at once.
+                                         Defaults to twice the total number of workers,
+                                         with each AI worker counted as `max_pages`
+                                         pages when `multi_page` is configured.
+            use_cache (bool): Read from the result cache, if one is configured.
+
+        Yields:
+            PageResult: The page index with either its data or the error it raised,
+                        and the metrics collected for it.
+                        A failing page does not interrupt the rest of the batch.
+        """
+        if ocr_workers < 1 or ai_workers < 1:
+            raise ValueError("ocr_workers and ai_workers must be at least 1.")
+        self._check_api_key(asynchronous=False)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        if max_pending is None:
+            multi_page = self._multi_page_config()
+            pages_per_request = multi_page["max_pages"] if multi_page else 1
+            max_pending = 2 * (ocr_workers + ai_workers * pages_per_request)
+        return self._iter_batch(
+            images, ocr_methods, ocr_workers, ai_workers, ordered, max_pending, use_cache
+        )
+
+    def _iter_batch(
+        self,
+        images: Iterable[ImageInput],
+        ocr_methods: List[str],
+        ocr_workers: int,
+        ai_workers: int,
+        ordered: bool,
+        max_pending: int,
+        use_cache: bool,
+    ) -> Iterator[PageResult]:
+        # The AI pool is entered first so it is shut down last: OCR callbacks
+        # may still hand work to it while the OCR pool drains.
+        packer = self._page_packer()
+        # Pages submitted for OCR that have not reached the AI stage yet, and whether
+        # the consumer is blocked on results. When both say no more pages are coming,
+        # a partly filled pack is sent rather than held back.
+        state = {"arriving": 0, "waiting": False}
+        state_lock = threading.Lock()
+
+        with ThreadPoolExecutor(ai_workers, thread_name_prefix="comiq-ai") as ai_pool, \
+                ThreadPoolExecutor(ocr_workers, thread_name_prefix="comiq-ocr") as ocr_pool:
+
+            def send(pack: List[_PackedPage]):
+                ai_pool.submit(self._run_ai_pack, pack)
+
+            def dispatch(
+                image: np.ndarray, ocr_results: List[Dict], job: _PageJob, page_future: Future
+            ):
+                if packer is not None:
+                    candidate = self._pack_candidate(image, ocr_results, job, packer)
+                    if candidate is not None:
+                        for pack in packer.add(
+                            _PackedPage(image, ocr_results, job, *candidate, page_future)
+                        ):
+                            send(pack)
+                        return
+                ai_future = ai_pool.submit(self._run_ai, image, ocr_results, job)
+                ai_future.add_done_callback(lambda f: _chain_future(f, page_future))
+
+            def submit(image, job: _PageJob) -> Tuple[Future, Future]:
+                page_future = Future()
+                page_future.add_done_callback(lambda f: self._finish_job(job))
+
+                def on_ocr_done(ocr_future: Future):
+                    try:
+                        dispatch(*ocr_future.result(), job, page_future)
+                    except Exception as e:
+                        page_future.set_exception(e)
+                    finally:
+                        with state_lock:
+                            state["arriving"] -= 1
+                            idle = state["arriving"] == 0 and state["waiting"]
+                        if idle and packer is not None:
+                            for pack in packer.flush():
+                                send(pack)
+
+                with state_lock:
+                    state["arriving"] += 1
+                ocr_future = ocr_pool.submit(self._ocr_stage, image, ocr_methods, job)
+                ocr_future.add_done_callback(on_ocr_done)
+                return page_future, ocr_future
+
+            def to_result(index: int, future: Future, job: _PageJob) -> PageResult:
+                try:
+                    return PageResult(index, future.result(), None, job.metrics)
+                except Exception as e:
+                    return PageResult(index, None, e, job.metrics)
+
+            image_iter = iter(images)
+            pending = deque()
+            next_index = 0
+            exhausted = False
+            try:
+                while True:
+                    with state_lock:
+                        state["waiting"] = False
+                    while not exhausted and len(pending) < max_pending:
+                        try:
+                            image = next(image_iter)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        job = _PageJob(use_cache, PipelineMetrics())
+                        pending.append((next_index, *submit(image, job), job))
+                        next_index += 1
+
+                    if not pending:
+                        return
+
+                    with state_lock:
+                        state["waiting"] = True
+                        idle = state["arriving"] == 0
+                    if idle and packer is not None:
+                        for pack in packer.flush():
+                            send(pack)
+
+                    if ordered:
+                        index, page_future, _, job = pending.popleft()
+                        yield to_result(index, page_future, job)
+                    else:
+                        done, _ = wait([item[1] for item in pending], return_when=FIRST_COMPLETED)
+                        for item in [item for item in pending if item[1] in done]:
+                            pending.remove(item)
+                            yield to_result(item[0], item[1], item[3])
+            finally:
+                # Abandoned early: drop pages that have not started OCR yet.
+                for _, _, ocr_future, _ in pending:
+                    ocr_future.cancel()
+
+    async def aextract(
+        self,
+        image: ImageInput,
+        ocr: Union[str, List[str]] = "paddleocr",
+        executor: Optional[Executor] = None,
+        use_cache: bool = True,
+        return_metrics: bool = False,
+    ) -> Union[List[Dict[str, Any]], Tuple[List[Dict[str, Any]], PipelineMetrics]]:
+        """
+        Asynchronous version of `extract`. Image loading and OCR run in `executor`
+        (the event loop's default executor if None) and the AI request is awaited
+        on an `AsyncOpenAI` client, so the event loop is never blocked.
+
+        Args:
+            image (str, bytes or numpy.ndarray): Path to the image file, the contents of
+                                                 one (bytes, a buffer, an mmap or a binary
+                                                 file object), or a numpy array of the image.
+            ocr (str or list): The OCR method(s) to use.
+            executor (Executor, optional): Executor used for the CPU-bound stages.
+            use_cache (bool): Read from the result cache, if one is configured.
+            return_metrics (bool): Also return the `PipelineMetrics` collected for the page.
+
+        Returns:
+            list: Processed data containing text extractions and their locations, or a
+                  (data, metrics) tuple if `return_metrics` is True.
+        """
+        self._check_api_key(asynchronous=True)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        loop = asyncio.get_running_loop()
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            image, ocr_results = await loop.run_in_executor(
+                executor, self._ocr_stage, image, ocr_methods, job
+            )
+            data = await self._arun_ai(image, ocr_results, job)
+        finally:
+            self._finish_job(job)
+        return (data, job.metrics) if return_metrics else data
+
+    async def aextract_state(
+        self,
+        image: ImageInput,
+        ocr: Union[str, List[str]] = "paddleocr",
+        executor: Optional[Executor] = None,
+        use_cache: bool = True,
+    ) -> PageState:
+        """Asynchronous version of `extract_state`; see `aextract` for `executor`."""
+        self._check_api_key(asynchronous=True)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        loop = asyncio.get_running_loop()
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            image, ocr_results = await loop.run_in_executor(
+                executor, self._ocr_stage, image, ocr_methods, job
+            )
+            ocr_results = assign_ids_to_bounds(ocr_results)
+            analysis, ai_input = await self._agroup(image, ocr_results, job)
+            data = self._finalize(image, analysis, ai_input, job)
+        finally:
+            self._finish_job(job)
+        return PageState(data, ocr_results, analysis, job.metrics)
+
+    async def aregroup(
+        self,
+        image: ImageInput,
+        state: PageState,
+        ocr_results: List[Dict],
+        context: float = 60,
+        executor: Optional[Executor] = None,
+        use_cache: bool = True,
+    ) -> PageState:
+        """Asynchronous version of `regroup`; see `aextract` for `executor`."""
+        loop = asyncio.get_running_loop()
+        self._check_api_key(asynchronous=True)
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            with job.metrics.stage("load"):
+                image = await loop.run_in_executor(executor, self._load_image, image)
+            ocr_results, diff, regions = self._plan_regroup(
+                image, state, ocr_results, context, job
+            )
+            semaphore = asyncio.Semaphore(max(1, self._ai_workers()))
+
+            async def answer(region: RegroupRegion) -> Optional[ComicAnalysis]:
+                if not region.boxes:
+                    return None
+                crop, bounds = self._region_input(image, ocr_results, region)
+                async with semaphore:
+                    return (await self._agroup(crop, bounds, job))[0]
+
+            answers = await asyncio.gather(*(answer(region) for region in regions))
+            analysis, data = self._splice(image, state, ocr_results, diff, regions, answers, job)
+        finally:
+            self._finish_job(job)
+        return PageState(data, ocr_results, analysis, job.metrics)
+
+    async def aextract_stream(
+        self,
+        image: ImageInput,
+        ocr: Union[str, List[str]] = "paddleocr",
+        executor: Optional[Executor] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Asynchronous version of `extract_stream`. Image loading and OCR run in
+        `executor` (the event loop's default executor if None).
+
+        Yields:
+            dict: One text group, in the same format as the items returned by `extract`.
+        """
+        self._check_api_key(asynchronous=True)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        loop = asyncio.get_running_loop()
+        job = _PageJob(use_cache, PipelineMetrics())
+        try:
+            image, ocr_results = await loop.run_in_executor(
+                executor, self._ocr_stage, image, ocr_methods, job
+            )
+            regions = self._ai_regions(image, ocr_results)
+            if regions is None:
+                async for result in self._astream_analyze(image, ocr_results, job):
+                    yield result
+                return
+
+            job.metrics.count("ai_regions", len(regions))
+            semaphore = asyncio.Semaphore(max(1, self._ai_workers()))
+
+            async def analyze(region):
+                async with semaphore:
+                    return await self._aanalyze_region(image, region, job)
+
+            tasks = [asyncio.ensure_future(analyze(region)) for region in regions]
+            try:
+                parts = []
+                delivered = 0
+                for (box, _), task in zip(regions, tasks):
+                    parts.append((box, await task))
+                    merged = merge_region_results(parts)
+                    for result in merged[delivered:]:
+                        yield result
+                    delivered = len(merged)
+            finally:
+                for task in tasks:
+                    task.cancel()
+        finally:
+            self._finish_job(job)
+
+    async def aextract_batch(
+        self,
+        images: Iterable[ImageInput],
+        ocr: Union[str, List[str]] = "paddleocr",
+        ocr_workers: int = 1,
+        max_concurrency: int = 8,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[PageResult]:
+        """
+        Asynchronous version of `extract_batch`. OCR runs on a pool of
+        `ocr_workers` threads while up to `max_concurrency` AI requests are awaited
+        concurrently on the event loop.
+
+        Args:
+            images (iterable): Pages as accepted by `extract`. Consumed lazily.
+            ocr (str or list): The OCR method(s) to use.
+            ocr_workers (int): Number of pages recognized at the same time.
+            max_concurrency (int): Number of AI requests in flight at the same time.
+            ordered (bool): Yield results in input order. If False, results are
+                            yielded as soon as each page completes.
+            max_pending (int, optional): Upper bound on pages held in memory at once.
+                                         Defaults to twice the total concurrency, with
+                                         each AI request counted as `max_pages` pages
+                                         when `multi_page` is configured.
+            use_cache (bool): Read from the result cache, if one is configured.
+
+        Yields:
+            PageResult: The page index with either its data or the error it raised,
+                        and the metrics collected for it.
+        """
+        if ocr_workers < 1 or max_concurrency < 1:
+            raise ValueError("ocr_workers and max_concurrency must be at least 1.")
+        self._check_api_key(asynchronous=True)
+        ocr_methods = self._resolve_ocr_methods(ocr)
+        if max_pending is None:
+            multi_page = self._multi_page_config()
+            pages_per_request = multi_page["max_pages"] if multi_page else 1
+            max_pending = 2 * (ocr_workers + max_concurrency * pages_per_request)
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        ocr_pool = ThreadPoolExecutor(ocr_workers, thread_name_prefix="comiq-ocr")
+        packer = self._page_packer()
+        pack_tasks = set()
+        arriving = 0
+
+        async def run_pack(pack: List[_PackedPage]):
+            async with semaphore:
+                await self._arun_ai_pack(pack)
+
+        def send(pack: List[_PackedPage]):
+            task = asyncio.ensure_future(run_pack(pack))
+            pack_tasks.add(task)
+            task.add_done_callback(pack_tasks.discard)
+
+        async def run_page(index: int, image) -> PageResult:
+            nonlocal arriving
+            job = _PageJob(use_cache, PipelineMetrics())
+            try:
+                packed = None
+                try:
+                    image, ocr_results = await loop.run_in_executor(
+                        ocr_pool, self._ocr_stage, image, ocr_methods, job
+                    )
+                    if packer is not None:
+                        candidate = await loop.run_in_executor(
+                            None, self._pack_candidate, image, ocr_results, job, packer
+                        )
+                        if candidate is not None:
+                            packed = loop.create_future()
+                            for pack in packer.add(
+                                _PackedPage(image, ocr_results, job, *candidate, packed)
+                            ):
+                                send(pack)
+                finally:
+                    arriving -= 1
+                    if arriving == 0 and packer is not None:
+                        for pack in packer.flush():
+                            send(pack)
+                if packed is not None:
+                    data = await packed
+                else:
+                    async with semaphore:
+                        data = await self._arun_ai(image, ocr_results, job)
+                return PageResult(index, data, None, job.metrics)
+            except Exception as e:
+                return PageResult(index, None, e, job.metrics)
+            finally:
+                self._finish_job(job)
+
+        image_iter = iter(images)
+        pending = deque()
+        next_index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    try:
+                        image = next(image_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    arriving += 1
+                    pending.append(asyncio.ensure_future(run_page(next_index, image)))
+                    next_index += 1
+
+                if not pending:
+                    return
+
+                if ordered:
+                    yield await pending.popleft()
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in [task for task in pending if task in done]:
+                        pending.remove(task)
+                        yield task.result()
+        finally:
+            for task in [*pending, *pack_tasks]:
+                task.cancel()
+            # Do not block the event loop on OCR calls that are already running.
+            ocr_pool.shutdown(wait=False)
@@ -0,0 +1,108 @@
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Peak resident set size of the current process, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PipelineMetrics:
+    """
+    Timings and counters collected while one page goes through the pipeline.
+
+    `stages` holds wall time in seconds per stage. Stages that run several times
+    for a page (per engine, per tile or per AI window) are summed. `counters`
+    holds sizes and counts such as `bytes_sent`, `prompt_tokens`,
+    `completion_tokens`, `ocr_boxes` and `groups`. Safe to update from several
+    threads.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.peak_rss_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Times the enclosed block and adds it to stage `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_usage(self, usage: Any):
+        """Adds the token usage of an OpenAI response, if the provider reported it."""
+        if usage is None:
+            return
+        for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            value = getattr(usage, field, None)
+            if value is not None:
+                self.count(field, value)
+
+    def add_share(self, shared: "PipelineMetrics", index: int, parts: int):
+        """
+        Adds the metrics of a request shared by `parts` pages, this page being the
+        `index`-th. Stage times are added in full, since every page waited for them,
+        and counters are split so they still add up across the pages.
+        """
+        data = shared.as_dict()
+        for name, seconds in data["stages"].items():
+            self.add_time(name, seconds)
+        for name, value in data["counters"].items():
+            self.count(name, value // parts + (value % parts if index == 0 else 0))
+
+    def finish(self):
+        """Records the total wall time and the process's peak memory."""
+        self.add_time("total", time.perf_counter() - self._start)
+        self.peak_rss_bytes = peak_rss_bytes()
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stages": dict(self.stages),
+                "counters": dict(self.counters),
+                "peak_rss_bytes": self.peak_rss_bytes,
+            }
+
+    def __repr__(self) -> str:
+        return f"PipelineMetrics({self.as_dict()})"
+
+
+def metrics_logger(
+    logger: Optional[logging.Logger] = None, level: int = logging.INFO
+) -> Callable[[PipelineMetrics], None]:
+    """Returns a metrics callback for `ComiQ` that writes one line per page to `logger`."""
+    logger = logger or logging.getLogger("comiq.metrics")
+
+    def log(metrics: PipelineMetrics):
+        data = metrics.as_dict()
+        stages = " ".join(f"{name}={seconds:.3f}s" for name, seconds in data["stages"].items())
+        counters = " ".join(f"{name}={value}" for name, value in data["counters"].items())
+        logger.log(level, "%s %s peak_rss=%s", stages, counters, data["peak_rss_bytes"])
+
+    return log
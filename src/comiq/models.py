@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 
 class Group(BaseModel):
@@ -21,3 +21,13 @@ class Group(BaseModel):
 class ComicAnalysis(BaseModel):
     """The root model for the AI's analysis of the comic image."""
     groups: List[Group] = Field(..., description="A list of all text groups found in the comic.")
+
+
+class PageGroup(Group):
+    """A `Group` from a request that covers several pages, tagged with its page."""
+    page_id: Optional[str] = Field(None, description="The id of the page the group belongs to.")
+
+
+class MultiPageAnalysis(BaseModel):
+    """The AI's analysis of several comic pages sent in one request."""
+    groups: List[PageGroup] = Field(..., description="The text groups of every page.")
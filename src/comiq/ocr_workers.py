@@ -0,0 +1,183 @@
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+from .ocr import _ocr_engines, get_available_ocr_engines
+
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+)
+
+
+def limit_threads(threads: int):
+    """
+    Caps the threads used by the numeric libraries of the current process:
+    OpenMP, MKL and OpenBLAS through their environment variables and, when they
+    are available, OpenCV, PyTorch and threadpoolctl at runtime.
+    """
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+    try:
+        import cv2
+        cv2.setNumThreads(threads)
+    except ImportError:
+        pass
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(threads)
+    except ImportError:
+        pass
+
+
+def _init_worker(threads: Optional[int], preload: List[Tuple[Callable, Dict[str, Any]]]):
+    if threads:
+        limit_threads(threads)
+    blank = np.full((32, 32, 3), 255, dtype=np.uint8)
+    for engine, kwargs in preload:
+        engine(blank, **kwargs)
+
+
+def _run_in_worker(
+    engine: Callable,
+    name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    kwargs: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        image = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        try:
+            return engine(image, **kwargs)
+        finally:
+            del image
+    finally:
+        block.close()
+
+
+class OCRProcessPool:
+    """
+    Runs OCR engines in a pool of worker processes.
+
+    EasyOCR and PaddleOCR hold the GIL for long stretches, so OCR does not scale
+    with threads. Each worker process keeps its own engine pool, so a model is
+    loaded once per worker and reused. Pages reach the workers through
+    `multiprocessing.shared_memory`: the image is copied once into a shared
+    block, and the worker reads it as a NumPy view instead of unpickling a copy.
+
+    `engine()` returns a callable with the signature of a registered engine,
+    so the pool plugs into `register_ocr_engine` and `perform_ocr`:
+
+        pool = OCRProcessPool(workers=8, threads_per_worker=4)
+        register_ocr_engine("easyocr", pool.engine("easyocr"))
+
+    Args:
+        workers (int, optional): Number of worker processes. Defaults to the CPU
+                                 count divided by `threads_per_worker`.
+        threads_per_worker (int, optional): Thread limit for OpenMP, MKL, OpenBLAS,
+                                            OpenCV and PyTorch in each worker.
+                                            None leaves the libraries' defaults.
+        preload (dict, optional): Engine names mapped to their configuration, run
+                                  once on a blank image when each worker starts.
+        mp_context (str): Multiprocessing start method. "spawn" is safe with
+                          threads and GPUs on every platform.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        threads_per_worker: Optional[int] = 1,
+        preload: Optional[Dict[str, Dict[str, Any]]] = None,
+        mp_context: str = "spawn",
+    ):
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) // max(1, threads_per_worker or 1))
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.workers = workers
+        preload_engines = [
+            (self._resolve(method), kwargs) for method, kwargs in (preload or {}).items()
+        ]
+        self._executor = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker,
+            initargs=(threads_per_worker, preload_engines),
+        )
+
+    @staticmethod
+    def _resolve(engine: Union[str, Callable]) -> Callable:
+        """Looks up a registered engine and checks that it can be sent to a worker."""
+        if isinstance(engine, str):
+            if engine not in _ocr_engines:
+                raise ValueError(
+                    f"OCR engine '{engine}' is not registered. "
+                    f"Available engines: {get_available_ocr_engines()}"
+                )
+            engine = _ocr_engines[engine]
+        try:
+            pickle.dumps(engine)
+        except Exception as e:
+            raise TypeError(
+                f"OCR engine {engine!r} cannot be sent to a worker process. "
+                "Use a function defined at module level."
+            ) from e
+        return engine
+
+    def run(
+        self, engine: Union[str, Callable], image: np.ndarray, **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Runs `engine` (a registered name or a module-level function) on `image` in a worker."""
+        return self._submit(self._resolve(engine), image, kwargs)
+
+    def _submit(
+        self, engine: Callable, image: np.ndarray, kwargs: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        image = np.ascontiguousarray(image)
+        block = shared_memory.SharedMemory(create=True, size=max(1, image.nbytes))
+        try:
+            view = np.ndarray(image.shape, dtype=image.dtype, buffer=block.buf)
+            view[...] = image
+            del view
+            future = self._executor.submit(
+                _run_in_worker, engine, block.name, image.shape, image.dtype.str, kwargs
+            )
+            return future.result()
+        finally:
+            block.close()
+            block.unlink()
+
+    def engine(self, engine: Union[str, Callable]) -> Callable[..., List[Dict[str, Any]]]:
+        """
+        Returns an OCR engine that runs `engine` in this pool, for `register_ocr_engine`.
+        The engine is looked up now, so the name can then be re-registered to the
+        returned callable.
+        """
+        target = self._resolve(engine)
+
+        def run(image: np.ndarray, **kwargs) -> List[Dict[str, Any]]:
+            return self._submit(target, image, kwargs)
+
+        run.__name__ = f"{getattr(target, '__name__', 'engine')}_in_process_pool"
+        return run
+
+    def close(self):
+        """Shuts the worker processes down."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "OCRProcessPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
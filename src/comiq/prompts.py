@@ -72,4 +72,67 @@ Additional Guidelines:
 Analyze the image and OCR data thoroughly to produce accurate and contextually appropriate groupings with cleaned and corrected text that reflects the comic's essential narrative elements. Remember to include background text and sound effects only when they are crucial to the story or scene interpretation.
 If sound effects and background text are purely decorative or do not add meaningful information, exclude them from your groupings.
 Properly format the output json
-'''
\ No newline at end of file
+'''
+
+# Variant of `comic_prompt` for the compact OCR payload formats. {0} is the
+# encoded payload and {1} describes its layout.
+comic_prompt_compact = comic_prompt.replace(
+    "OCR Text Locations:\n```json\n{0}\n```",
+    "OCR Text Locations ({1}):\n```\n{0}\n```",
+)
+
+ocr_payload_descriptions = {
+    "legacy": (
+        "a list of dictionaries with the box id, its text and its text_box "
+        "[ymin, xmin, ymax, xmax] on a 0-1000 scale"
+    ),
+    "json": (
+        "a JSON array with one entry per word box: [id, ymin, xmin, ymax, xmax, text], "
+        "coordinates on a 0-1000 scale"
+    ),
+    "table": (
+        "one word box per line as id|ymin,xmin,ymax,xmax|text, "
+        "coordinates on a 0-1000 scale"
+    ),
+}
+
+# Variant of `comic_prompt` for several pages sent in one request, each image
+# preceded by its page id. {0} holds one `ocr_page_block` per page and {1}
+# describes the layout of the boxes.
+comic_prompt_multi_page = (
+    comic_prompt.replace(
+        "Analyze the comic image,",
+        "Analyze the comic pages (one image per page, each preceded by its page id),",
+    )
+    .replace(
+        "OCR Text Locations:\n```json\n{0}\n```",
+        "OCR Text Locations ({1}), one block per page. Box IDs are unique across all pages:\n{0}",
+    )
+    .replace('      "panel_id": "1",\n', '      "page_id": "1",\n      "panel_id": "1",\n')
+    .replace(
+        "Additional Guidelines:\n",
+        "Additional Guidelines:\n"
+        "- Keep pages separate: set \"page_id\" to the page the boxes come from, never group "
+        "boxes from different pages, and number panels separately on each page.\n",
+    )
+)
+
+ocr_page_block = "Page {0}:\n```\n{1}\n```"
+
+# Sent, without the image, when a response does not match the output format.
+# {0} is the previous response and {1} the validation errors.
+repair_prompt = (
+    """Your previous response could not be parsed:
+
+```
+{0}
+```
+
+Problems found:
+{1}
+
+Reply again with only the corrected JSON object, keeping the same groups and text.
+
+"""
+    + comic_prompt[comic_prompt.index("Output Format:"):comic_prompt.index("Additional Guidelines:")]
+)
@@ -0,0 +1,366 @@
+import asyncio
+import email.utils
+import functools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from pydantic import ValidationError
+from .metrics import PipelineMetrics
+from .prompts import repair_prompt
+
+_T = TypeVar("_T")
+
+
+@functools.lru_cache(maxsize=None)
+def _tiktoken_encoding(name: str):
+    try:
+        import tiktoken
+    except ImportError:
+        raise ImportError(
+            f"tiktoken is required to count tokens with the '{name}' encoding. "
+            "Install it with `pip install tiktoken`, or leave `tokenizer` unset."
+        ) from None
+    return tiktoken.get_encoding(name)
+
+
+def estimate_tokens(text: str, tokenizer: Optional[str] = None) -> int:
+    """
+    Estimates the number of tokens in `text` as one per four characters.
+    Tokenizers differ between providers, so treat this as an estimate.
+
+    Pass the name of a tiktoken encoding (e.g. "o200k_base") as `tokenizer` to
+    count exactly with it instead. This needs tiktoken, which may download the
+    encoding the first time it is used.
+    """
+    if tokenizer is not None:
+        return len(_tiktoken_encoding(tokenizer).encode(text))
+    return len(text) // 4
+
+
+class _TokenBucket:
+    """A bucket refilled continuously at `rate` units per minute, holding at most one minute's worth."""
+
+    def __init__(self, rate: float):
+        self.rate = rate / 60.0
+        self.capacity = float(rate)
+        self.level = float(rate)
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Takes `amount` from the bucket and returns how long to wait before using it."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def adjust(self, amount: float):
+        self.level = min(self.capacity, self.level - amount)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds requested by a Retry-After (or retry-after-ms) response header, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed request is worth sending again: timeouts, connection errors, 408, 409, 429 and 5xx."""
+    import openai
+
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+def _validation_summary(error: ValidationError, limit: int = 10) -> str:
+    lines = [
+        f"- {'.'.join(str(part) for part in item['loc']) or 'response'}: {item['msg']}"
+        for item in error.errors()[:limit]
+    ]
+    if len(error.errors()) > limit:
+        lines.append(f"- ... and {len(error.errors()) - limit} more")
+    return "\n".join(lines)
+
+
+class RequestScheduler:
+    """
+    Rate limiting, retries and response repair for AI requests.
+
+    Requests wait for capacity in two token buckets, one for requests per minute
+    and one for tokens per minute, so a batch stays under the provider's quota
+    instead of running into 429 errors. Token use is estimated before each
+    request and corrected with the reported usage afterwards.
+
+    Failed requests that are worth retrying (see `is_retryable`) are sent again
+    after an exponential backoff with full jitter, or after the delay asked for
+    by a Retry-After header. A 429 pauses every request that shares the
+    scheduler. A response that does not match the output format is not
+    recomputed: the model is asked to repair it with a short text-only prompt.
+
+    Args:
+        requests_per_minute (float, optional): Request quota. None for no limit.
+        tokens_per_minute (float, optional): Token quota (prompt and completion). None for no limit.
+        max_attempts (int): Attempts per request, including the first one.
+        backoff_base (float): Upper bound of the first backoff delay in seconds;
+                              doubled for every further attempt.
+        backoff_max (float): Largest delay between attempts in seconds.
+        timeout (float, optional): Timeout in seconds for each attempt.
+        repair_attempts (int): How many times to ask the model to repair an invalid response.
+        image_tokens (int): Tokens assumed for the page image when estimating a request.
+        tokenizer (str, optional): tiktoken encoding used to count prompt tokens
+                                   (see `estimate_tokens`). None for the
+                                   four-characters-per-token estimate.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_attempts: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        timeout: Optional[float] = None,
+        repair_attempts: int = 1,
+        image_tokens: int = 1500,
+        tokenizer: Optional[str] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.repair_attempts = repair_attempts
+        self.image_tokens = image_tokens
+        self.tokenizer = tokenizer
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    # --- Rate limiting ---
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimates the tokens of `text` with this scheduler's `tokenizer`."""
+        return estimate_tokens(text, self.tokenizer)
+
+    def reserve(self, tokens: int) -> float:
+        """Reserves capacity for one request and returns how many seconds to wait before sending it."""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+            return wait
+
+    def settle(self, estimated_tokens: int, usage: Any):
+        """Corrects the token bucket with the usage a response reported."""
+        total = getattr(usage, "total_tokens", None)
+        if self._tokens is None or total is None:
+            return
+        with self._lock:
+            self._tokens.adjust(total - estimated_tokens)
+
+    def acquire(self, tokens: int, metrics: Optional[PipelineMetrics] = None):
+        """Blocks until a request of about `tokens` tokens may be sent."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            if metrics is not None:
+                metrics.add_time("rate_limit", wait)
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int, metrics: Optional[PipelineMetrics] = None):
+        """Asynchronous version of `acquire`."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            if metrics is not None:
+                metrics.add_time("rate_limit", wait)
+            await asyncio.sleep(wait)
+
+    # --- Retries ---
+
+    def retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """
+        Seconds to wait before retrying after `error` on the zero-based `attempt`,
+        or None if the request should not be retried.
+        """
+        if attempt + 1 >= self.max_attempts or not is_retryable(error):
+            return None
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        delay = min(self.backoff_max, max(0.0, delay))
+        if getattr(error, "status_code", None) == 429:
+            with self._lock:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
+
+    def request_options(self) -> Dict[str, Any]:
+        """Per-request options for `chat.completions.create`."""
+        return {} if self.timeout is None else {"timeout": self.timeout}
+
+    @staticmethod
+    def repair_messages(response_text: str, error: ValidationError) -> List[Dict]:
+        return [
+            {
+                "role": "user",
+                "content": repair_prompt.format(response_text, _validation_summary(error)),
+            }
+        ]
+
+    # --- Running requests ---
+
+    def open_stream(
+        self,
+        request: Callable[..., Any],
+        messages: List[Dict],
+        estimated_tokens: int,
+        metrics: PipelineMetrics,
+    ) -> Any:
+        """
+        Opens a streamed request, retrying until the provider accepts it. Errors
+        after the first chunk are not retried, since part of the response may
+        already have been delivered.
+        """
+        attempt = 0
+        estimated_tokens += self.image_tokens
+        while True:
+            self.acquire(estimated_tokens, metrics)
+            try:
+                return request(messages=messages, stream=True, **self.request_options())
+            except Exception as e:
+                delay = self.retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                metrics.count("retries")
+                time.sleep(delay)
+                attempt += 1
+
+    async def aopen_stream(
+        self,
+        request: Callable[..., Any],
+        messages: List[Dict],
+        estimated_tokens: int,
+        metrics: PipelineMetrics,
+    ) -> Any:
+        """Asynchronous version of `open_stream`; `request` returns an awaitable."""
+        attempt = 0
+        estimated_tokens += self.image_tokens
+        while True:
+            await self.aacquire(estimated_tokens, metrics)
+            try:
+                return await request(messages=messages, stream=True, **self.request_options())
+            except Exception as e:
+                delay = self.retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                metrics.count("retries")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def run(
+        self,
+        request: Callable[..., Any],
+        messages: List[Dict],
+        estimated_tokens: int,
+        parse: Callable[[str], _T],
+        metrics: PipelineMetrics,
+    ) -> _T:
+        """
+        Sends `messages` with `request` (a partial of `chat.completions.create`),
+        retrying and repairing as configured, and returns the parsed response.
+        """
+        attempt = 0
+        repairs = 0
+        estimated_tokens += self.image_tokens
+        while True:
+            self.acquire(estimated_tokens, metrics)
+            try:
+                with metrics.stage("request"):
+                    response = request(messages=messages, **self.request_options())
+            except Exception as e:
+                delay = self.retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                metrics.count("retries")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            self.settle(estimated_tokens, getattr(response, "usage", None))
+            metrics.record_usage(getattr(response, "usage", None))
+            response_text = response.choices[0].message.content or ""
+            try:
+                with metrics.stage("parse"):
+                    return parse(response_text)
+            except ValidationError as e:
+                if repairs >= self.repair_attempts:
+                    raise
+                repairs += 1
+                metrics.count("repairs")
+                messages = self.repair_messages(response_text, e)
+                estimated_tokens = self.estimate_tokens(messages[0]["content"])
+
+    async def arun(
+        self,
+        request: Callable[..., Any],
+        messages: List[Dict],
+        estimated_tokens: int,
+        parse: Callable[[str], _T],
+        metrics: PipelineMetrics,
+    ) -> _T:
+        """Asynchronous version of `run`; `request` returns an awaitable."""
+        attempt = 0
+        repairs = 0
+        estimated_tokens += self.image_tokens
+        while True:
+            await self.aacquire(estimated_tokens, metrics)
+            try:
+                with metrics.stage("request"):
+                    response = await request(messages=messages, **self.request_options())
+            except Exception as e:
+                delay = self.retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                metrics.count("retries")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            self.settle(estimated_tokens, getattr(response, "usage", None))
+            metrics.record_usage(getattr(response, "usage", None))
+            response_text = response.choices[0].message.content or ""
+            try:
+                with metrics.stage("parse"):
+                    return parse(response_text)
+            except ValidationError as e:
+                if repairs >= self.repair_attempts:
+                    raise
+                repairs += 1
+                metrics.count("repairs")
+                messages = self.repair_messages(response_text, e)
+                estimated_tokens = self.estimate_tokens(messages[0]["content"])
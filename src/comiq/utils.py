@@ -1,37 +1,83 @@
-from typing import List, Dict
-import cv2
+from collections import Counter
+from typing import TYPE_CHECKING, List, Dict, NamedTuple, Optional, Set, Tuple, Union
 import numpy as np
-from PIL import Image
-from .models import ComicAnalysis
+from .models import ComicAnalysis, Group
 
+if TYPE_CHECKING:
+    from PIL import Image
 
-def cv2pil(image: np.ndarray) -> Image.Image:
+
+def cv2pil(image: np.ndarray) -> "Image.Image":
     """Convert Processed OpenCV image to PIL Image."""
+    import cv2
+    from PIL import Image
+
     return Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
 
 
+class BoxArray(NamedTuple):
+    """
+    Word boxes held as arrays: an (N, 4) int32 array of [ymin, xmin, ymax, xmax]
+    boxes with the parallel texts and string ids. Used inside the pipeline so
+    coordinate conversions and group merging work on whole arrays; dicts are only
+    built at the API boundary.
+    """
+    boxes: np.ndarray
+    texts: List[str]
+    ids: List[str]
+
+    @classmethod
+    def from_bounds(cls, bounds: List[Dict]) -> "BoxArray":
+        """Builds a BoxArray from OCR bounds, numbering them "0", "1", ... unless they have ids."""
+        boxes = np.rint(
+            np.array([bound["text_box"] for bound in bounds], dtype=np.float64).reshape(-1, 4)
+        ).astype(np.int32)
+        return cls(
+            boxes,
+            [bound["text"] for bound in bounds],
+            [str(bound.get("id", i)) for i, bound in enumerate(bounds)],
+        )
+
+    def to_bounds(self) -> List[Dict]:
+        """The boxes as `{"text_box", "text", "id"}` dicts."""
+        return [
+            {"text_box": box, "text": text, "id": box_id}
+            for box, text, box_id in zip(self.boxes.tolist(), self.texts, self.ids)
+        ]
+
+    def normalized(self, height: int, width: int) -> "BoxArray":
+        """The same boxes on the 0-1000 scale used by the AI model."""
+        return self._replace(boxes=normalize_boxes(self.boxes, height, width))
+
+
+def normalize_boxes(boxes: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Converts (N, 4) pixel boxes to the 0-1000 scale, rounding to the nearest unit."""
+    scale = np.array([1000 / height, 1000 / width, 1000 / height, 1000 / width])
+    return np.rint(np.asarray(boxes, dtype=np.float64).reshape(-1, 4) * scale).astype(np.int32)
+
+
+def denormalize_boxes(boxes: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Converts (N, 4) boxes on the 0-1000 scale to pixels, rounding to the nearest pixel."""
+    scale = np.array([height / 1000, width / 1000, height / 1000, width / 1000])
+    return np.rint(np.asarray(boxes, dtype=np.float64).reshape(-1, 4) * scale).astype(np.int32)
+
+
 def ai2norm(bounds: List[Dict], height: int, width: int) -> List[Dict]:
-    """Converts AI-supported bounds (0-1000 scale) to normal image coordinates."""
-    for bound in bounds:
-        box = bound["text_box"]
-        x_min = int((box[1] / 1000) * width)
-        y_min = int((box[0] / 1000) * height)
-        x_max = int((box[3] / 1000) * width)
-        y_max = int((box[2] / 1000) * height)
-        bound["text_box"] = [y_min, x_min, y_max, x_max]
-    return bounds
+    """
+    Converts AI-supported bounds (0-1000 scale) to normal image coordinates.
+    Returns new dicts; the input is not modified.
+    """
+    boxes = denormalize_boxes([bound["text_box"] for bound in bounds], height, width)
+    return [{**bound, "text_box": box} for bound, box in zip(bounds, boxes.tolist())]
 
 
 def norm2ai(bounds: List[Dict], height: int, width: int) -> List[Dict]:
-    """Converts normal image coordinates to AI-supported bounds (0-1000 scale)."""
-    for bound in bounds:
-        box = bound["text_box"]
-        x_min = int((box[1] / width) * 1000)
-        y_min = int((box[0] / height) * 1000)
-        x_max = int((box[3] / width) * 1000)
-        y_max = int((box[2] / height) * 1000)
-        bound["text_box"] = [y_min, x_min, y_max, x_max]
-    return bounds
+    """
+    Converts normal image coordinates to AI-supported bounds (0-1000 scale).
+    Returns new dicts; the input is not modified.
+    """
+    boxes = normalize_boxes([bound["text_box"] for bound in bounds], height, width)
+    return [{**bound, "text_box": box} for bound, box in zip(bounds, boxes.tolist())]
 
 
 def assign_ids_to_bounds(bounds: List[Dict]) -> List[Dict]:
@@ -39,33 +85,470 @@ def assign_ids_to_bounds(bounds: List[Dict]) -> List[Dict]:
     return [{**bound, "id": str(i)} for i, bound in enumerate(bounds)]
 
 
+def group_boxes(
+    box_array: BoxArray, box_ids: List[List[str]]
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    Computes the bounding box of each group of box ids in one pass.
+
+    Returns a (G, 4) array with one box per group that has at least one known id,
+    and the indices of those groups in `box_ids`.
+    """
+    index = {box_id: i for i, box_id in enumerate(box_array.ids)}
+    members: List[int] = []
+    starts: List[int] = []
+    kept: List[int] = []
+    for g, ids in enumerate(box_ids):
+        found = [index[box_id] for box_id in ids if box_id in index]
+        if found:
+            starts.append(len(members))
+            members.extend(found)
+            kept.append(g)
+    if not kept:
+        return np.empty((0, 4), dtype=np.int32), kept
+
+    boxes = box_array.boxes[members]
+    starts_array = np.array(starts)
+    mins = np.minimum.reduceat(boxes[:, :2], starts_array, axis=0)
+    maxs = np.maximum.reduceat(boxes[:, 2:], starts_array, axis=0)
+    return np.hstack([mins, maxs]), kept
+
+
 def merge_box_groups(
-    predicted_groups: ComicAnalysis, bounds_with_ids: List[Dict]
+    predicted_groups: ComicAnalysis, bounds_with_ids: Union[List[Dict], BoxArray]
 ) -> List[Dict]:
     """Merges OCR-detected boxes into text bubbles based on the AI's analysis."""
-    id_to_bound = {bound["id"]: bound for bound in bounds_with_ids}
+    if not isinstance(bounds_with_ids, BoxArray):
+        bounds_with_ids = BoxArray.from_bounds(bounds_with_ids)
+    groups = predicted_groups.groups
+    boxes, kept = group_boxes(bounds_with_ids, [group.box_ids for group in groups])
+
     merged = []
+    for box, g in zip(boxes.tolist(), kept):
+        group = groups[g]
+        merged.append(
+            {
+                "text_box": box,
+                "text": group.cleaned_text,
+                "panel_id": group.panel_id,
+                "text_bubble_id": group.text_bubble_id,
+                "type": group.type,
+                "style": group.style,
+            }
+        )
+    return merged
 
-    for group in predicted_groups.groups:
-        relevant_boxes = [
-            id_to_bound[box_id]["text_box"]
-            for box_id in group.box_ids
-            if box_id in id_to_bound
-        ]
 
-        if relevant_boxes:
-            ymin = min(box[0] for box in relevant_boxes)
-            xmin = min(box[1] for box in relevant_boxes)
-            ymax = max(box[2] for box in relevant_boxes)
-            xmax = max(box[3] for box in relevant_boxes)
-            merged.append(
-                {
-                    "text_box": [ymin, xmin, ymax, xmax],
-                    "text": group.cleaned_text,
-                    "panel_id": group.panel_id,
-                    "text_bubble_id": group.text_bubble_id,
-                    "type": group.type,
-                    "style": group.style,
-                }
+def offset_bounds(bounds: List[Dict], dy: int, dx: int) -> List[Dict]:
+    """Returns copies of the bounds with their boxes shifted by (dy, dx) pixels."""
+    return [
+        {
+            **bound,
+            "text_box": [
+                bound["text_box"][0] + dy,
+                bound["text_box"][1] + dx,
+                bound["text_box"][2] + dy,
+                bound["text_box"][3] + dx,
+            ],
+        }
+        for bound in bounds
+    ]
+
+
+def split_into_windows(
+    bounds: List[Dict], height: int, width: int, window: int
+) -> List[Tuple[Tuple[int, int, int, int], List[Dict]]]:
+    """
+    Splits a tall page into horizontal windows of about `window` pixels for
+    separate AI requests. Each box belongs to the window holding its center, and
+    a window grows to fully contain its boxes. Windows without boxes are skipped.
+
+    Returns a list of ((ymin, xmin, ymax, xmax), bounds) pairs in page coordinates.
+    """
+    last = max(0, (height - 1) // window)
+    assigned: Dict[int, List[Dict]] = {}
+    for bound in bounds:
+        center = (bound["text_box"][0] + bound["text_box"][2]) / 2
+        index = min(max(int(center // window), 0), last)
+        assigned.setdefault(index, []).append(bound)
+
+    regions = []
+    for index in sorted(assigned):
+        members = assigned[index]
+        ymin = max(0, min([index * window] + [b["text_box"][0] for b in members]))
+        ymax = min(height, max([(index + 1) * window] + [b["text_box"][2] for b in members]))
+        regions.append(((ymin, 0, ymax, width), members))
+    return regions
+
+
+def _widest_gap(
+    bounds: List[Dict], region: Tuple[int, int, int, int], min_gap: float
+) -> Optional[Tuple[int, int]]:
+    """
+    Finds the widest empty band between boxes, across rows or columns of the region.
+    Gaps are measured on a 0-1000 scale of the region size.
+
+    Returns (axis, position) with axis 0 for a horizontal cut and 1 for a
+    vertical cut, or None if no gap is at least `min_gap` wide.
+    """
+    best = None
+    for axis in (0, 1):
+        size = max(1, region[axis + 2] - region[axis])
+        spans = sorted((b["text_box"][axis], b["text_box"][axis + 2]) for b in bounds)
+        reach = spans[0][1]
+        for start, end in spans[1:]:
+            gap = (start - reach) * 1000 / size
+            if gap >= min_gap and (best is None or gap > best[0]):
+                best = (gap, axis, (start + reach) // 2)
+            reach = max(reach, end)
+    return None if best is None else best[1:]
+
+
+def split_into_clusters(
+    bounds: List[Dict],
+    region: Tuple[int, int, int, int],
+    max_boxes: int = 60,
+    min_gap: float = 10,
+    right_to_left: bool = False,
+) -> List[Tuple[Tuple[int, int, int, int], List[Dict]]]:
+    """
+    Splits the boxes of a region into spatial clusters of at most about
+    `max_boxes` boxes for separate AI requests. The region is cut recursively
+    along the widest empty band between boxes (an XY-cut), which usually falls on
+    the gutters between panels. A cluster that has no gap of at least `min_gap`
+    (0-1000 scale) is kept whole even if it has more boxes.
+
+    Clusters are ordered top to bottom, then left to right, or right to left for
+    manga when `right_to_left` is set. Returns a list of
+    ((ymin, xmin, ymax, xmax), bounds) pairs in the coordinates of `bounds`.
+    """
+    clusters = []
+
+    def cut(cell, members):
+        split = _widest_gap(members, cell, min_gap) if len(members) > max_boxes else None
+        if split is None:
+            clusters.append((cell, members))
+            return
+        axis, position = split
+        before = [b for b in members if b["text_box"][axis] < position]
+        after = [b for b in members if b["text_box"][axis] >= position]
+        ymin, xmin, ymax, xmax = cell
+        if axis == 0:
+            parts = [((ymin, xmin, position, xmax), before), ((position, xmin, ymax, xmax), after)]
+        else:
+            parts = [((ymin, xmin, ymax, position), before), ((ymin, position, ymax, xmax), after)]
+            if right_to_left:
+                parts.reverse()
+        for part in parts:
+            cut(*part)
+
+    if bounds:
+        cut(tuple(region), list(bounds))
+    return clusters
+
+
+def merge_region_results(
+    parts: List[Tuple[Tuple[int, int, int, int], List[Dict]]]
+) -> List[Dict]:
+    """
+    Combines the results of regions that were analyzed separately. Boxes are
+    shifted from region to page coordinates and panels are renumbered in order,
+    so `panel_id` and `text_bubble_id` stay unique across the page.
+    """
+    merged = []
+    next_panel = 1
+    for (ymin, xmin, _, _), results in parts:
+        panels: Dict[str, str] = {}
+        for result in offset_bounds(results, ymin, xmin):
+            old_panel = result["panel_id"]
+            if old_panel not in panels:
+                panels[old_panel] = str(next_panel)
+                next_panel += 1
+            new_panel = panels[old_panel]
+            bubble = result["text_bubble_id"]
+            if bubble.startswith(f"{old_panel}-"):
+                bubble = bubble[len(old_panel) + 1:]
+            result["panel_id"] = new_panel
+            result["text_bubble_id"] = f"{new_panel}-{bubble}"
+            merged.append(result)
+    return merged
+
+
+def merge_overlapping_boxes(boxes: np.ndarray) -> np.ndarray:
+    """Merges overlapping (N, 4) boxes into their bounding boxes until none overlap."""
+    while len(boxes) > 1:
+        top_left = np.maximum(boxes[:, None, :2], boxes[None, :, :2])
+        bottom_right = np.minimum(boxes[:, None, 2:], boxes[None, :, 2:])
+        overlaps = (bottom_right > top_left).all(axis=2)
+        parent = list(range(len(boxes)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(*np.nonzero(np.triu(overlaps, 1))):
+            parent[find(i)] = find(j)
+        roots = np.array([find(i) for i in range(len(boxes))])
+        if len(np.unique(roots)) == len(boxes):
+            break
+        merged = []
+        for root in np.unique(roots):
+            members = boxes[roots == root]
+            merged.append(np.concatenate([members[:, :2].min(axis=0), members[:, 2:].max(axis=0)]))
+        boxes = np.array(merged)
+    return boxes
+
+
+class BoxDiff(NamedTuple):
+    """How a page's OCR boxes changed, by position in the old and new box lists."""
+    matched: Dict[int, int]
+    added: List[int]
+    removed: List[int]
+
+
+class RegroupRegion(NamedTuple):
+    """
+    A part of the page to group again: the crop sent to the model, the new boxes
+    in it and the old groups its answer replaces.
+    """
+    crop: Tuple[int, int, int, int]
+    boxes: List[int]
+    groups: List[int]
+
+
+def diff_boxes(old: List[Dict], new: List[Dict]) -> BoxDiff:
+    """
+    Matches two OCR box lists. A box is unchanged if the new list has a box with
+    the same coordinates and text; anything else counts as removed and added.
+    """
+    unmatched: Dict[Tuple, List[int]] = {}
+    for i, bound in enumerate(old):
+        key = (tuple(bound["text_box"]), bound["text"])
+        unmatched.setdefault(key, []).append(i)
+    matched = {}
+    added = []
+    for i, bound in enumerate(new):
+        candidates = unmatched.get((tuple(bound["text_box"]), bound["text"]))
+        if candidates:
+            matched[candidates.pop(0)] = i
+        else:
+            added.append(i)
+    removed = sorted(i for candidates in unmatched.values() for i in candidates)
+    return BoxDiff(matched, added, removed)
+
+
+def plan_regroup(
+    analysis: ComicAnalysis,
+    old: List[Dict],
+    new: List[Dict],
+    diff: BoxDiff,
+    height: int,
+    width: int,
+    context: float = 60,
+) -> List[RegroupRegion]:
+    """
+    Finds the parts of a page that have to be grouped again after its boxes
+    changed. Each added or removed box is padded by `context` (0-1000 scale of
+    the page size) and overlapping areas are merged. A region takes the new boxes
+    centered in it and every old group with a box there or a removed box, and
+    then all the boxes of those groups, so groups are replaced whole. Regions
+    that share a group are merged.
+
+    `analysis` refers to the old boxes by their position in `old`. The returned
+    regions refer to new boxes by position in `new` and to groups by their index
+    in `analysis.groups`, in page order. A region without boxes only drops groups.
+    """
+    if not diff.added and not diff.removed:
+        return []
+    owner: Dict[int, int] = {}
+    members: List[List[int]] = []
+    for g, group in enumerate(analysis.groups):
+        ids = [int(i) for i in group.box_ids if i.isdigit() and int(i) < len(old)]
+        members.append(ids)
+        for i in ids:
+            owner.setdefault(i, g)
+    old_to_new = diff.matched
+    new_to_old = {n: o for o, n in old_to_new.items()}
+
+    seeds = [new[i]["text_box"] for i in diff.added] + [old[i]["text_box"] for i in diff.removed]
+    pad = np.array([-context * height, -context * width, context * height, context * width]) / 1000
+    areas = np.clip(
+        np.rint(np.array(seeds, dtype=np.float64) + pad),
+        0,
+        [height, width, height, width],
+    ).astype(np.int64)
+    areas = merge_overlapping_boxes(areas)
+
+    new_boxes = np.array([bound["text_box"] for bound in new], dtype=np.float64).reshape(-1, 4)
+    centers = (new_boxes[:, :2] + new_boxes[:, 2:]) / 2
+    removed_boxes = np.array(
+        [old[i]["text_box"] for i in diff.removed], dtype=np.float64
+    ).reshape(-1, 4)
+    removed_centers = (removed_boxes[:, :2] + removed_boxes[:, 2:]) / 2
+
+    plans = []
+    for area in areas:
+        inside = ((centers >= area[:2]) & (centers <= area[2:])).all(axis=1)
+        boxes: Set[int] = set(np.flatnonzero(inside).tolist())
+        removed_inside = ((removed_centers >= area[:2]) & (removed_centers <= area[2:])).all(axis=1)
+        removed = [diff.removed[k] for k in np.flatnonzero(removed_inside)]
+        groups: Set[int] = {owner[i] for i in removed if i in owner}
+        while True:
+            groups |= {owner[new_to_old[i]] for i in boxes if new_to_old.get(i) in owner}
+            grown = boxes | {old_to_new[o] for g in groups for o in members[g] if o in old_to_new}
+            if grown == boxes:
+                break
+            boxes = grown
+        plans.append((area, boxes, groups))
+
+    # Regions that share a box or a group are answered by one request.
+    merged: List[list] = []
+    for area, boxes, groups in plans:
+        for other in [m for m in merged if m[1] & boxes or m[2] & groups]:
+            merged.remove(other)
+            area = np.concatenate(
+                [np.minimum(area[:2], other[0][:2]), np.maximum(area[2:], other[0][2:])]
             )
-    return merged
\ No newline at end of file
+            boxes, groups = boxes | other[1], groups | other[2]
+        merged.append([area, boxes, groups])
+
+    regions = []
+    for area, boxes, groups in merged:
+        # The crop grows to hold every box of the groups it replaces.
+        crop = np.vstack([area] + [new_boxes[i] for i in boxes])
+        crop = np.concatenate([crop[:, :2].min(axis=0), crop[:, 2:].max(axis=0)])
+        crop = np.clip(np.rint(crop), 0, [height, width, height, width]).astype(int)
+        regions.append(RegroupRegion(tuple(crop.tolist()), sorted(boxes), sorted(groups)))
+    regions.sort(key=lambda region: (region.crop[0], region.crop[1]))
+    return regions
+
+
+def _intersection_area(a: List[int], b: List[int]) -> int:
+    """Area shared by two `[ymin, xmin, ymax, xmax]` boxes."""
+    height = min(a[2], b[2]) - max(a[0], b[0])
+    width = min(a[3], b[3]) - max(a[1], b[1])
+    return max(0, height) * max(0, width)
+
+
+def splice_groups(
+    analysis: ComicAnalysis,
+    diff: BoxDiff,
+    regions: List[RegroupRegion],
+    answers: List[Optional[ComicAnalysis]],
+    old_bounds: Optional[List[Dict]] = None,
+    new_bounds: Optional[List[Dict]] = None,
+) -> ComicAnalysis:
+    """
+    Replaces the groups of each region with the model's answer for it (None for
+    a region without boxes). Kept groups get the new box ids. A new group takes
+    the panel and bubble ids of the replaced group it shares most boxes with,
+    if those are still free. A new group made only of added boxes, such as an
+    edited one-box bubble, takes the free ids of the replaced group whose removed
+    boxes overlap it most (given `old_bounds` and `new_bounds`, the old and new
+    box lists), or of the first replaced group still free. Otherwise it gets the
+    panel most of its boxes came from and the next free bubble number, or a new
+    panel.
+
+    `analysis` refers to old box positions and the answers to new ones, as
+    strings. The result refers to new box positions.
+    """
+    replaced = {g for region in regions for g in region.groups}
+    new_to_old = {n: o for o, n in diff.matched.items()}
+    old_owner: Dict[int, int] = {}
+    for g, group in enumerate(analysis.groups):
+        for box_id in group.box_ids:
+            if box_id.isdigit():
+                old_owner.setdefault(int(box_id), g)
+    removed_boxes: Dict[int, List[int]] = {}
+    for o in diff.removed:
+        if o in old_owner:
+            removed_boxes.setdefault(old_owner[o], []).append(o)
+
+    kept: Dict[int, Group] = {}
+    for g, group in enumerate(analysis.groups):
+        if g not in replaced:
+            box_ids = [
+                str(diff.matched[int(box_id)])
+                for box_id in group.box_ids
+                if box_id.isdigit() and int(box_id) in diff.matched
+            ]
+            kept[g] = group.model_copy(update={"box_ids": box_ids})
+    used_bubbles = {group.text_bubble_id for group in kept.values()}
+    panels = [group.panel_id for group in analysis.groups]
+    next_panel = max([int(p) for p in panels if p.isdigit()] + [0]) + 1
+
+    def bubble_number(bubble_id: str) -> int:
+        tail = bubble_id.rsplit("-", 1)[-1]
+        return int(tail) if tail.isdigit() else 0
+
+    def removed_overlap(g: int, box_ids: List[str]) -> int:
+        if old_bounds is None or new_bounds is None:
+            return 0
+        return sum(
+            _intersection_area(old_bounds[o]["text_box"], new_bounds[int(box_id)]["text_box"])
+            for o in removed_boxes.get(g, [])
+            for box_id in box_ids
+        )
+
+    spliced: Dict[int, List[Group]] = {}
+    appended: List[Group] = []
+    for region, answer in zip(regions, answers):
+        allowed = {str(i) for i in region.boxes}
+        candidates = []
+        for group in answer.groups if answer is not None else []:
+            # Ids outside the region would duplicate boxes of the kept groups.
+            box_ids = [box_id for box_id in group.box_ids if box_id in allowed]
+            if not box_ids:
+                continue
+            sources = Counter(
+                old_owner[new_to_old[int(box_id)]]
+                for box_id in box_ids
+                if new_to_old.get(int(box_id)) in old_owner
+            )
+            candidates.append((group, box_ids, sources))
+
+        new_groups: List[Optional[Group]] = [None] * len(candidates)
+        # Groups with unchanged boxes claim the ids they came from before groups
+        # made only of added boxes fall back to the remaining ones.
+        for i in sorted(range(len(candidates)), key=lambda i: not candidates[i][2]):
+            group, box_ids, sources = candidates[i]
+            panel_id = bubble_id = None
+            for g, _ in sources.most_common():
+                if g in region.groups and analysis.groups[g].text_bubble_id not in used_bubbles:
+                    panel_id = analysis.groups[g].panel_id
+                    bubble_id = analysis.groups[g].text_bubble_id
+                    break
+            if bubble_id is None and not sources:
+                free = [
+                    g for g in region.groups
+                    if analysis.groups[g].text_bubble_id not in used_bubbles
+                ]
+                if free:
+                    g = max(free, key=lambda g: (removed_overlap(g, box_ids), -g))
+                    panel_id = analysis.groups[g].panel_id
+                    bubble_id = analysis.groups[g].text_bubble_id
+            if bubble_id is None:
+                if sources:
+                    panel_id = analysis.groups[sources.most_common(1)[0][0]].panel_id
+                else:
+                    panel_id = str(next_panel)
+                    next_panel += 1
+                taken = [bubble_number(b) for b in used_bubbles if b.startswith(f"{panel_id}-")]
+                bubble_id = f"{panel_id}-{max(taken + [0]) + 1}"
+            used_bubbles.add(bubble_id)
+            new_groups[i] = group.model_copy(
+                update={"box_ids": box_ids, "panel_id": panel_id, "text_bubble_id": bubble_id}
+            )
+        if region.groups:
+            spliced[min(region.groups)] = new_groups
+        else:
+            appended.extend(new_groups)
+
+    groups: List[Group] = []
+    for g in range(len(analysis.groups)):
+        if g in kept:
+            groups.append(kept[g])
+        groups.extend(spliced.get(g, []))
+    return ComicAnalysis(groups=groups + appended)
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from comiq.ai_processing import GroupStreamParser
+
+
+def _group(bubble_id):
+    return {
+        "panel_id": "1",
+        "text_bubble_id": bubble_id,
+        "box_ids": ["0"],
+        "original_text": "WAIT [sic]",
+        "cleaned_text": "Wait",
+        "type": "dialogue",
+        "style": "normal",
+        "notes": "",
+    }
+
+
+def _parse(text, chunk_size=7):
+    parser = GroupStreamParser()
+    groups = []
+    for i in range(0, len(text), chunk_size):
+        groups += parser.feed(text[i:i + chunk_size])
+    return groups + parser.close()
+
+
+def test_brackets_before_the_groups_key_are_skipped():
+    text = json.dumps({"notes": "see [1]", "groups": [_group("1-1"), _group("1-2")]})
+    assert [g.text_bubble_id for g in _parse(text)] == ["1-1", "1-2"]
+
+
+def test_groups_are_delivered_while_streaming():
+    text = json.dumps({"groups": [_group("1-1"), _group("1-2")]})
+    parser = GroupStreamParser()
+    cut = text.index('"1-2"')
+    assert len(parser.feed(text[:cut])) == 1
+    assert len(parser.feed(text[cut:])) == 1
+    assert parser.close() == []
+
+
+def test_bare_list_and_markdown_fence():
+    assert len(_parse(json.dumps([_group("1-1")]))) == 1
+    assert len(_parse("```json\n" + json.dumps({"groups": [_group("1-1")]}) + "\n```")) == 1
+
+
+def test_close_raises_on_invalid_response():
+    with pytest.raises(ValidationError):
+        _parse("Here is [1] answer: " + json.dumps({"groups": [_group("1-1")]}))
+    with pytest.raises(ValidationError):
+        _parse(json.dumps({"groups": [_group("1-1")]})[:-2])